@@ -0,0 +1,194 @@
+import time
+from collections import OrderedDict
+
+ONLINE_STATUSES = frozenset({"online", "idle", "dnd"})
+
+
+def _top(counts, limit):
+    return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit])
+
+
+class MemberActivity:
+    """Live presence state for one member plus totals accrued since the last rollup."""
+
+    __slots__ = (
+        "status", "status_since", "changed_at", "activity", "activity_since",
+        "online", "transitions", "activities", "history", "history_pos",
+    )
+
+    def __init__(self, now, history_size):
+        self.status = None
+        self.status_since = now
+        self.changed_at = now
+        self.activity = None
+        self.activity_since = now
+        self.online = 0.0
+        self.transitions = 0
+        self.activities = {}
+        self.history = [None] * history_size
+        self.history_pos = 0
+
+    def observe(self, status, activity, now, activity_slots):
+        if status != self.status:
+            if self.status in ONLINE_STATUSES:
+                self.online += now - self.status_since
+            if self.status is not None:
+                self.transitions += 1
+            self.status = status
+            self.status_since = self.changed_at = now
+            self.history[self.history_pos] = (int(now), status)
+            self.history_pos = (self.history_pos + 1) % len(self.history)
+        if activity != self.activity:
+            if self.activity is not None:
+                self._credit(self.activity, now - self.activity_since, activity_slots)
+            self.activity = activity
+            self.activity_since = now
+
+    def _credit(self, name, seconds, slots):
+        # Space-saving top-k: a newcomer takes over the smallest slot and its
+        # count, so the table never grows past ``slots`` entries.
+        counts = self.activities
+        if name not in counts and len(counts) >= slots:
+            victim = min(counts, key=counts.get)
+            counts[name] = counts.pop(victim)
+        counts[name] = counts.get(name, 0.0) + seconds
+
+    def delta(self, now, activity_slots, drain=False):
+        """Everything accrued since the last drain, with open intervals counted up to ``now``."""
+        online = self.online
+        if self.status in ONLINE_STATUSES:
+            online += now - self.status_since
+        activities = dict(self.activities)
+        if self.activity is not None:
+            activities[self.activity] = activities.get(self.activity, 0.0) + now - self.activity_since
+        size = len(self.history)
+        history = [self.history[(self.history_pos + i) % size] for i in range(size)]
+        delta = {
+            "online": online,
+            "transitions": self.transitions,
+            "activities": _top(activities, activity_slots),
+            "history": [list(h) for h in history if h is not None],
+            "status": self.status,
+            "changed_at": int(self.changed_at),
+            "last_seen": int(now),
+        }
+        if drain:
+            self.status_since = self.activity_since = now
+            self.online = 0.0
+            self.transitions = 0
+            self.activities = {}
+            self.history = [None] * size
+            self.history_pos = 0
+        return delta
+
+    def is_idle(self):
+        return (
+            self.status not in ONLINE_STATUSES and self.activity is None and not self.transitions
+            and not self.activities and not any(self.history)
+        )
+
+
+class ActivityTracker:
+    """Presence aggregates for opted-in guilds with a hard cap on tracked members.
+
+    At most ``max_members`` members are live; past that the least recently
+    updated one is evicted and its unsaved totals wait in ``pending`` (also
+    capped at ``max_members``) until the next rollup. Anything that would
+    exceed both caps is dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, max_members=50000, top_activities=5, history_size=10):
+        self.max_members = max_members
+        self.top_activities = top_activities
+        self.activity_slots = top_activities * 2
+        self.history_size = history_size
+        self.members = OrderedDict()  # (guild_id, user_id) -> MemberActivity
+        self.pending = {}  # (guild_id, user_id) -> delta of an evicted member
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.members) + len(self.pending)
+
+    @property
+    def backlogged(self):
+        """True once evictions have filled half of ``pending``; time for an early rollup."""
+        return len(self.pending) * 2 >= self.max_members
+
+    def update(self, guild_id, user_id, status, activity, now=None):
+        if now is None:
+            now = time.time()
+        key = (guild_id, user_id)
+        entry = self.members.get(key)
+        if entry is None:
+            if len(self.members) >= self.max_members:
+                self._evict(now)
+            entry = self.members[key] = MemberActivity(now, self.history_size)
+        else:
+            self.members.move_to_end(key)
+        entry.observe(status, activity, now, self.activity_slots)
+
+    def _evict(self, now):
+        key, entry = self.members.popitem(last=False)
+        if entry.is_idle():
+            return
+        self._park(key, entry.delta(now, self.activity_slots, drain=True))
+
+    def _park(self, key, delta):
+        if key in self.pending:
+            self.pending[key] = self.merge(self.pending[key], delta)
+        elif len(self.pending) < self.max_members:
+            self.pending[key] = delta
+        else:
+            self.dropped += 1
+
+    def forget_guild(self, guild_id):
+        for key in [k for k in self.members if k[0] == guild_id]:
+            del self.members[key]
+        for key in [k for k in self.pending if k[0] == guild_id]:
+            del self.pending[key]
+
+    def collect(self, now=None):
+        """Drain every unsaved delta as ``{(guild_id, user_id): delta}`` for a rollup."""
+        if now is None:
+            now = time.time()
+        changes, self.pending = self.pending, {}
+        for key, entry in self.members.items():
+            if entry.is_idle():
+                continue
+            delta = entry.delta(now, self.activity_slots, drain=True)
+            changes[key] = self.merge(changes[key], delta) if key in changes else delta
+        return changes
+
+    def restore(self, changes):
+        # Put deltas back after a failed rollup so the next one retries them.
+        for key, delta in changes.items():
+            self._park(key, delta)
+
+    def snapshot(self, guild_id, user_id, stored, now=None):
+        """``stored`` (the persisted aggregate, or None) with any unsaved activity merged in."""
+        if now is None:
+            now = time.time()
+        key = (guild_id, user_id)
+        if key in self.pending:
+            stored = self.merge(stored, self.pending[key])
+        entry = self.members.get(key)
+        if entry is not None:
+            stored = self.merge(stored, entry.delta(now, self.activity_slots))
+        return stored
+
+    def merge(self, stored, delta):
+        """Fold ``delta`` into ``stored``; also used by storage to combine rows in its own thread."""
+        if not stored:
+            stored = {"online": 0.0, "transitions": 0, "activities": {}, "history": []}
+        activities = dict(stored["activities"])
+        for name, seconds in delta["activities"].items():
+            activities[name] = activities.get(name, 0.0) + seconds
+        return {
+            "online": stored["online"] + delta["online"],
+            "transitions": stored["transitions"] + delta["transitions"],
+            "activities": _top(activities, self.activity_slots),
+            "history": (stored["history"] + delta["history"])[-self.history_size:],
+            "status": delta["status"] or stored.get("status"),
+            "changed_at": delta["changed_at"] if delta["history"] else stored.get("changed_at", delta["changed_at"]),
+            "last_seen": delta["last_seen"],
+        }
@@ -0,0 +1,82 @@
+import asyncio
+import csv
+import gzip
+import json
+import time
+
+from storage import AUDIT_FIELDS
+
+
+class AuditLog:
+    """Moderation actions on their way to the append-only audit store.
+
+    ``record`` returns immediately; rows are written in one batch at most
+    ``delay`` seconds later. Readers call ``flush`` first so a query never
+    misses an action that was just taken. Failed writes stay queued for the
+    next flush.
+    """
+
+    def __init__(self, storage, delay=1.0):
+        self.storage = storage
+        self.delay = delay
+        self._pending = []
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    def record(self, guild_id, action, targets, moderator_id, reason):
+        """Queue one entry per ``(target_id, target)`` pair; ``target_id`` may be None."""
+        now = time.time()
+        for target_id, target in targets:
+            self._pending.append({
+                "guild_id": guild_id, "created_at": now, "action": action, "target_id": target_id,
+                "target": target, "moderator_id": moderator_id, "reason": reason,
+            })
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(self.delay)
+            await self.flush()
+        finally:
+            self._task = None
+
+    async def flush(self):
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                await self.storage.append_audit(batch)
+            except Exception as e:
+                self._pending[:0] = batch
+                print(f"[audit] Failed to save {len(batch)} entries: {e}")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        await self.flush()
+
+
+def _write_page(out, writer, fmt, page):
+    if fmt == "csv":
+        writer.writerows([entry[f] for f in AUDIT_FIELDS] for entry in page)
+    else:
+        out.writelines(json.dumps(entry) + "\n" for entry in page)
+
+
+async def export(storage, guild_id, path, fmt="jsonl", since=None):
+    """Stream a guild's audit log into a gzipped JSONL/CSV file at ``path``; returns the entry count.
+
+    Pages come from storage one at a time and are compressed off the loop, so
+    memory stays flat however long the log is.
+    """
+    count = 0
+    with gzip.open(path, "wt", newline="") as out:
+        writer = csv.writer(out) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(AUDIT_FIELDS)
+        async for page in storage.iter_audit(guild_id, since):
+            await asyncio.to_thread(_write_page, out, writer, fmt, page)
+            count += len(page)
+    return count
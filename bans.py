@@ -0,0 +1,48 @@
+from sortedcontainers import SortedList
+
+
+class BanIndex:
+    """In-memory view of one guild's ban list, searchable by ID, name or name prefix."""
+
+    def __init__(self):
+        self.users = {}
+        self._names = SortedList()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.users)
+
+    def add(self, user):
+        self.remove(user.id)
+        self.users[user.id] = user
+        self._names.add((user.name.lower(), user.id))
+
+    def remove(self, user_id):
+        user = self.users.pop(user_id, None)
+        if user is not None:
+            self._names.discard((user.name.lower(), user.id))
+
+    def by_name(self, name):
+        name = name.lower()
+        return [self.users[uid] for _, uid in self._names.irange((name, 0), (name, float("inf")))]
+
+    def by_prefix(self, prefix):
+        prefix = prefix.lower()
+        return [
+            self.users[uid]
+            for _, uid in self._names.irange((prefix, 0), (prefix + "\U0010ffff", 0), inclusive=(True, False))
+        ]
+
+    def find(self, query):
+        """Resolve a user ID, mention, ``name``, legacy ``name#1234`` or ``prefix*``."""
+        query = query.strip()
+        digits = query.strip("<@!>")
+        if digits.isdigit():
+            user = self.users.get(int(digits))
+            return [user] if user else []
+        if query.endswith("*"):
+            return self.by_prefix(query[:-1])
+        name, sep, discriminator = query.rpartition("#")
+        if sep and discriminator.isdigit():
+            return [u for u in self.by_name(name) if u.discriminator == discriminator]
+        return self.by_name(query)
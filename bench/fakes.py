@@ -0,0 +1,320 @@
+"""Offline stand-ins for the discord.py objects the cogs touch.
+
+Every REST-backed coroutine records a call on the shared ``Rest`` recorder
+instead of talking to Discord, optionally sleeping to simulate latency.
+"""
+import asyncio
+import itertools
+from collections import Counter
+from datetime import timedelta
+
+import discord
+
+from outbound import OutboundScheduler
+
+_ids = itertools.count(10**17)
+
+
+def next_id():
+    return next(_ids)
+
+
+class Rest:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = Counter()
+
+    async def call(self, route):
+        self.calls[route] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeRole:
+    def __init__(self, guild, name, role_id=None):
+        self.guild = guild
+        self.name = name
+        self.id = role_id or next_id()
+
+
+class FakeUser:
+    def __init__(self, user_id, name, bot=False):
+        self.id = user_id
+        self.name = name
+        self.discriminator = "0"
+        self.bot = bot
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+    def __str__(self):
+        return self.name
+
+
+class FakeMember(FakeUser):
+    def __init__(self, guild, user_id, name, bot=False):
+        super().__init__(user_id, name, bot)
+        self.guild = guild
+        self.display_name = name
+        self.roles = [guild.default_role]
+        self.voice = None
+        self.joined_at = discord.utils.utcnow()
+
+    async def send(self, *args, **kwargs):
+        await self.guild.rest.call("POST /users/@me/channels/messages")
+
+    async def ban(self, **kwargs):
+        await self.guild.rest.call("PUT /guilds/bans")
+        self.guild.banned[self.id] = self
+
+    async def kick(self, **kwargs):
+        await self.guild.rest.call("DELETE /guilds/members")
+
+    async def timeout(self, until, **kwargs):
+        await self.guild.rest.call("PATCH /guilds/members")
+
+    async def add_roles(self, *roles, **kwargs):
+        await self.guild.rest.call("PUT /guilds/members/roles")
+        self.roles.extend(roles)
+
+    async def remove_roles(self, *roles, **kwargs):
+        await self.guild.rest.call("DELETE /guilds/members/roles")
+        self.roles = [r for r in self.roles if r not in roles]
+
+
+class FakeAttachment:
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.size = len(data)
+        self._data = data
+
+    async def read(self):
+        return self._data
+
+
+class FakeMessage:
+    def __init__(self, channel, author, content="", attachments=(), created_at=None):
+        self.id = next_id()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.attachments = list(attachments)
+        self.mentions = []
+        self.created_at = created_at or discord.utils.utcnow()
+
+    async def delete(self):
+        await self.guild.rest.call("DELETE /channels/messages")
+        self.channel.forget(self)
+
+    async def edit(self, **kwargs):
+        await self.guild.rest.call("PATCH /channels/messages")
+        self.content = kwargs.get("content", self.content)
+
+    async def add_reaction(self, emoji):
+        await self.guild.rest.call("PUT /channels/messages/reactions")
+
+
+class FakeTextChannel:
+    def __init__(self, guild, name, channel_id=None):
+        self.guild = guild
+        self.name = name
+        self.id = channel_id or next_id()
+        self.messages = {}
+        self.overwrites = {}
+        self.sent = 0
+
+    @property
+    def mention(self):
+        return f"<#{self.id}>"
+
+    async def send(self, content=None, **kwargs):
+        await self.guild.rest.call("POST /channels/messages")
+        self.sent += 1
+        return FakeMessage(self, self.guild.me, content or "")
+
+    def seed_history(self, author, count, age_days=0.0):
+        created = discord.utils.utcnow() - timedelta(days=age_days)
+        for i in range(count):
+            message = FakeMessage(self, author, f"message {i}", created_at=created)
+            self.messages[message.id] = message
+
+    def forget(self, message):
+        self.messages.pop(message.id, None)
+
+    async def history(self, limit=100, before=None, after=None):
+        # Newest first, in pages of 100 like the real endpoint.
+        snapshot = list(reversed(self.messages.values()))[:limit]
+        for start in range(0, len(snapshot), 100):
+            await self.guild.rest.call("GET /channels/messages")
+            for message in snapshot[start:start + 100]:
+                yield message
+
+    async def delete_messages(self, messages):
+        await self.guild.rest.call("POST /channels/messages/bulk-delete")
+        for message in messages:
+            self.forget(message)
+
+    def overwrites_for(self, target):
+        allow, deny = self.overwrites.get(target, (discord.Permissions.none(), discord.Permissions.none()))
+        return discord.PermissionOverwrite.from_pair(allow, deny)
+
+    async def set_permissions(self, target, *, overwrite=discord.utils.MISSING, **kwargs):
+        await self.guild.rest.call("PUT /channels/permissions")
+        if overwrite is None:
+            self.overwrites.pop(target, None)
+        elif overwrite is not discord.utils.MISSING:
+            self.overwrites[target] = overwrite.pair()
+
+    async def edit(self, **kwargs):
+        await self.guild.rest.call("PATCH /channels")
+
+
+class FakeVoiceChannel:
+    def __init__(self, guild, name, channel_id=None):
+        self.guild = guild
+        self.name = name
+        self.id = channel_id or next_id()
+        self.members = []
+
+    async def set_permissions(self, target, **kwargs):
+        await self.guild.rest.call("PUT /channels/permissions")
+
+    async def delete(self):
+        await self.guild.rest.call("DELETE /channels")
+        self.guild.channels.pop(self.id, None)
+
+
+class FakeCategory:
+    def __init__(self, guild, name):
+        self.guild = guild
+        self.name = name
+        self.id = next_id()
+
+
+class FakeGuild:
+    def __init__(self, rest, guild_id=None, name="Bench Guild"):
+        self.rest = rest
+        self.id = guild_id or next_id()
+        self.name = name
+        self.default_role = FakeRole(self, "@everyone", self.id)
+        self.roles = [self.default_role, FakeRole(self, "Muted")]
+        self.categories = []
+        self.channels = {}
+        self.members_by_id = {}
+        self.banned = {}
+        self.me = FakeMember(self, next_id(), "Volt", bot=True)
+        self.shard_id = 0
+
+    @property
+    def text_channels(self):
+        return [c for c in self.channels.values() if isinstance(c, FakeTextChannel)]
+
+    @property
+    def members(self):
+        return list(self.members_by_id.values())
+
+    def add_text_channel(self, name):
+        channel = FakeTextChannel(self, name)
+        self.channels[channel.id] = channel
+        return channel
+
+    def add_member(self, name, bot=False):
+        member = FakeMember(self, next_id(), name, bot)
+        self.members_by_id[member.id] = member
+        return member
+
+    def get_member(self, user_id):
+        return self.members_by_id.get(user_id)
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def fetch_member(self, user_id):
+        await self.rest.call("GET /guilds/members")
+        member = self.members_by_id.get(user_id)
+        if member is None:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Member")
+        return member
+
+    async def create_category(self, name):
+        await self.rest.call("POST /guilds/channels")
+        category = FakeCategory(self, name)
+        self.categories.append(category)
+        return category
+
+    async def create_voice_channel(self, name, category=None):
+        await self.rest.call("POST /guilds/channels")
+        channel = FakeVoiceChannel(self, name)
+        self.channels[channel.id] = channel
+        return channel
+
+    async def bans(self, limit=None):
+        await self.rest.call("GET /guilds/bans")
+        for user in list(self.banned.values()):
+            yield discord.guild.BanEntry(user=user, reason=None)
+
+    async def unban(self, user, **kwargs):
+        await self.rest.call("DELETE /guilds/bans")
+        self.banned.pop(user.id, None)
+
+
+class _FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "Fake"
+
+
+class FakeVoiceState:
+    def __init__(self, channel):
+        self.channel = channel
+
+
+class FakeContext:
+    def __init__(self, bot, message):
+        self.bot = bot
+        self.message = message
+        self.guild = message.guild
+        self.channel = message.channel
+        self.author = message.author
+        self.command_failed = False
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+
+class FakeBot:
+    """The subset of ``commands.Bot`` the cogs use, with cogs attached directly."""
+
+    def __init__(self, storage, pipeline, members):
+        self.storage = storage
+        self.pipeline = pipeline
+        self.members = members
+        self.outbound = OutboundScheduler()
+        self.carryover = {}
+        self.user = FakeUser(next_id(), "Volt", bot=True)
+        self.guilds = []
+        self.cogs = {}
+
+    def get_guild(self, guild_id):
+        return next((g for g in self.guilds if g.id == guild_id), None)
+
+    def get_cog(self, name):
+        return self.cogs.get(name)
+
+    async def wait_until_ready(self):
+        return None
+
+    async def is_owner(self, user):
+        return True
+
+    async def add_cog(self, cog):
+        self.cogs[type(cog).__name__] = cog
+        await discord.utils.maybe_coroutine(cog.cog_load)
+
+    async def close(self):
+        for cog in reversed(list(self.cogs.values())):
+            await discord.utils.maybe_coroutine(cog.cog_unload)
+        self.cogs.clear()
+        await self.outbound.close()
@@ -0,0 +1,329 @@
+"""Replay synthetic or recorded event streams through the real cogs, offline.
+
+The cogs from the cogs package run against the fakes in bench/fakes.py: REST calls are
+counted rather than sent, and storage lives in a temporary directory.
+
+    python bench/replay.py                              # every scenario, synthetic events
+    python bench/replay.py --scenario messages --events 50000
+    python bench/replay.py --record stream.jsonl        # also save the generated stream
+    python bench/replay.py --replay stream.jsonl        # replay a saved stream
+    python bench/replay.py --json new.json --compare old.json
+
+With --compare, any scenario whose throughput, p99 latency or bytes written
+is worse than the baseline by more than --tolerance percent is reported and
+the exit status is 1, so runs from two commits can be diffed in CI.
+
+Bytes written is what the scenario sent towards disk (Linux only). The temp
+directory must be on a disk-backed filesystem: on tmpfs it reads 0, so point
+TMPDIR elsewhere if /tmp is one.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cogs.automod import AutoMod  # noqa: E402
+from cogs.custom_vc import CustomVC  # noqa: E402
+from cogs.fun import Fun  # noqa: E402
+from cogs.leveling import Leveling  # noqa: E402
+from cogs.moderation import Moderation, PurgeFlags  # noqa: E402
+from fakes import (  # noqa: E402
+    FakeAttachment, FakeBot, FakeContext, FakeGuild, FakeMessage, FakeVoiceState, Rest,
+)
+from members import MemberLookup  # noqa: E402
+from pipeline import MessagePipeline  # noqa: E402
+from storage import create_storage  # noqa: E402
+
+SCENARIOS = ("messages", "moderation", "voice", "images", "raid")
+RAID_CHANNELS = 300
+WORDS = "the quick brown fox jumps over lazy dog hello world volt bot level up gg nice".split()
+
+
+def bytes_written():
+    # Linux only: bytes this process dirtied in files, i.e. storage writes. Unlike wchar it
+    # leaves out stdout, pipes to the image workers and sockets; every atomic_write still
+    # counts in full because each one writes a fresh temp file.
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# ---------------- Event generation ---------------- #
+def generate(scenario, count, rng, guilds, users):
+    if scenario == "messages":
+        for _ in range(count):
+            words = rng.choices(WORDS, k=rng.randint(3, 20))
+            if rng.random() < 0.02:
+                words.append("badword1")
+            yield {"t": "message", "g": rng.randrange(guilds), "u": rng.randrange(users), "c": rng.randrange(3),
+                   "content": " ".join(words)}
+    elif scenario == "moderation":
+        commands = ["warn", "warn", "warnings", "kick", "ban", "timeout", "clear"]
+        for _ in range(count):
+            name = rng.choice(commands)
+            event = {"t": "command", "name": name, "g": rng.randrange(guilds), "u": rng.randrange(1, users), "c": 0}
+            if name == "clear":
+                event["amount"] = rng.choice([50, 200, 1000])
+            yield event
+    elif scenario == "voice":
+        for g in range(guilds):
+            for v in range(5):
+                yield {"t": "command", "name": "createvc", "g": g, "u": v, "c": 0}
+        for _ in range(count):
+            yield {"t": "voice", "g": rng.randrange(guilds), "u": rng.randrange(users), "v": rng.randrange(5)}
+    elif scenario == "images":
+        for _ in range(count):
+            # A small pool of seeds so re-posted images hit the result cache.
+            yield {"t": "to_gif", "g": rng.randrange(guilds), "u": rng.randrange(users), "c": 0,
+                   "w": rng.choice([256, 800, 2000]), "h": rng.choice([256, 600, 1500]), "seed": rng.randrange(8)}
+    elif scenario == "raid":
+        # A join burst big enough to trip the detector in every guild, then a moderator lifts the lockdown.
+        for g in range(guilds):
+            yield {"t": "command", "name": "antiraid", "g": g, "u": 0, "c": 0}
+        for _ in range(count):
+            yield {"t": "join", "g": rng.randrange(guilds), "u": 0}
+        for g in range(guilds):
+            yield {"t": "command", "name": "unlockall", "g": g, "u": 0, "c": 0}
+
+
+def make_png(width, height, seed):
+    from PIL import Image
+
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), tuple(rng.randrange(256) for _ in range(3)))
+    out = BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+# ---------------- World ---------------- #
+class World:
+    def __init__(self, bot, rest, guild_count, user_count, channel_count=3):
+        self.bot = bot
+        self.rest = rest
+        self.guilds = []
+        self.vcs = {}
+        self.voice = {}
+        for g in range(guild_count):
+            guild = FakeGuild(rest, name=f"Guild {g}")
+            for c in range(channel_count):
+                guild.add_text_channel(f"chat-{c}")
+            guild.add_text_channel("mod-logs")
+            for u in range(user_count):
+                guild.add_member(f"user{u}")
+            self.guilds.append(guild)
+        bot.guilds = self.guilds
+
+    def guild(self, event):
+        return self.guilds[event["g"]]
+
+    def member(self, event):
+        return self.guild(event).members[event["u"]]
+
+    def channel(self, event):
+        return self.guild(event).text_channels[event.get("c", 0)]
+
+
+async def handle(world, event):
+    bot = world.bot
+    guild = world.guild(event)
+    member = world.member(event)
+    kind = event["t"]
+    if kind == "message":
+        message = FakeMessage(world.channel(event), member, event["content"])
+        await bot.pipeline.dispatch(message)
+    elif kind == "command":
+        channel = world.channel(event)
+        moderator = guild.members[0]
+        ctx = FakeContext(bot, FakeMessage(channel, moderator, f",{event['name']}"))
+        moderation = bot.get_cog("Moderation")
+        name = event["name"]
+        if name == "warn":
+            await moderation.warn.callback(moderation, ctx, member, reason="bench")
+        elif name == "warnings":
+            await moderation.warnings.callback(moderation, ctx, member)
+        elif name == "kick":
+            await moderation.kick.callback(moderation, ctx, member, reason="bench")
+        elif name == "ban":
+            await moderation.ban.callback(moderation, ctx, member, reason="bench")
+        elif name == "timeout":
+            await moderation.timeout.callback(moderation, ctx, member, 10, reason="bench")
+        elif name == "clear":
+            channel.seed_history(member, event["amount"])
+            flags = await PurgeFlags._construct_default(ctx)
+            await moderation.clear.callback(moderation, ctx, event["amount"], flags=flags)
+        elif name == "antiraid":
+            await moderation.antiraid.callback(moderation, ctx, "20", 10)
+        elif name == "unlockall":
+            # Lifting waits for the lockdown the burst triggered, so this event's latency covers both.
+            lockdown = moderation.lockdown_tasks.get(guild.id)
+            if lockdown is not None:
+                await lockdown
+            await moderation.unlockall.callback(moderation, ctx)
+        elif name == "createvc":
+            custom_vc = bot.get_cog("CustomVC")
+            await custom_vc.createvc.callback(custom_vc, ctx, name=f"vc-{event['u']}")
+            world.vcs.setdefault(guild.id, []).append(max(custom_vc.temp_channels[guild.id]))
+    elif kind == "join":
+        await bot.get_cog("Moderation").on_member_join(guild.add_member(f"raider{len(guild.members_by_id)}"))
+    elif kind == "voice":
+        # Toggle the member between a temp VC and no channel.
+        vc_ids = world.vcs.get(guild.id, [])
+        before = world.voice.get(member.id)
+        target = guild.get_channel(vc_ids[event["v"]]) if event["v"] < len(vc_ids) else None
+        after = None if before is not None else target
+        if before is not None and member in before.members:
+            before.members.remove(member)
+        if after is not None:
+            after.members.append(member)
+        world.voice[member.id] = after
+        await bot.get_cog("CustomVC").on_voice_state_update(member, FakeVoiceState(before), FakeVoiceState(after))
+    elif kind == "to_gif":
+        fun = bot.get_cog("Fun")
+        data = make_png(event["w"], event["h"], event["seed"])
+        message = FakeMessage(world.channel(event), member, ",to_gif", [FakeAttachment("upload.png", data)])
+        await fun.to_gif.callback(fun, FakeContext(bot, message))
+
+
+# ---------------- Runner ---------------- #
+async def run_scenario(name, events, args):
+    data_dir = tempfile.mkdtemp(prefix=f"volt-bench-{name}-")
+    try:
+        rest = Rest(args.rest_latency)
+        storage = create_storage(args.storage, data_dir, legacy_dir=data_dir)
+        await storage.open()
+        bot = FakeBot(storage, MessagePipeline(), MemberLookup())
+        world = World(bot, rest, args.guilds, args.users, RAID_CHANNELS if name == "raid" else 3)
+        for cog in (Moderation, Fun, CustomVC, Leveling, AutoMod):
+            await bot.add_cog(cog(bot))
+
+        written_before = bytes_written()
+        latencies = []
+        started = time.perf_counter()
+        for event in events:
+            t0 = time.perf_counter()
+            await handle(world, event)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        # Shutdown flushes count too: deferred writes are still writes.
+        await bot.close()
+        await storage.close()
+        written_after = bytes_written()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        "events": len(latencies),
+        "events_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "bytes_written": None if written_before is None else written_after - written_before,
+        "rest_calls": dict(rest.calls),
+    }
+
+
+def load_stream(path):
+    with open(path) as f:
+        header = json.loads(f.readline())
+        return header, [json.loads(line) for line in f]
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results.items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        checks = [("events_per_s", True), ("p99_ms", False), ("bytes_written", False)]
+        for metric, higher_is_better in checks:
+            a, b = old.get(metric), current.get(metric)
+            if not a or b is None:
+                continue
+            change = (b - a) / a * 100
+            worse = change < -tolerance if higher_is_better else change > tolerance
+            flag = "  REGRESSION" if worse else ""
+            print(f"  {name:<11} {metric:<14} {a:>14.3f} -> {b:>14.3f} ({change:+.1f}%){flag}")
+            if worse:
+                regressions.append((name, metric))
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--events", type=int, default=5000, help="synthetic events per scenario")
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--storage", choices=("sqlite", "json"), default="sqlite")
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="simulated seconds per REST call")
+    parser.add_argument("--record", help="write the generated stream to this JSONL file (single scenario)")
+    parser.add_argument("--replay", help="replay a JSONL stream written by --record")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    streams = {}
+    if args.replay:
+        header, events = load_stream(args.replay)
+        args.guilds, args.users = header["guilds"], header["users"]
+        streams[header["scenario"]] = events
+    else:
+        names = SCENARIOS if args.scenario == "all" else (args.scenario,)
+        for name in names:
+            count = args.events if name != "images" else max(1, args.events // 100)
+            rng = random.Random(f"{args.seed}-{name}")
+            streams[name] = list(generate(name, count, rng, args.guilds, args.users))
+        if args.record:
+            if len(streams) != 1:
+                parser.error("--record needs a single --scenario")
+            (name, events), = streams.items()
+            with open(args.record, "w") as f:
+                f.write(json.dumps({"scenario": name, "guilds": args.guilds, "users": args.users}) + "\n")
+                f.writelines(json.dumps(e) + "\n" for e in events)
+
+    results = {}
+    for name, events in streams.items():
+        results[name] = asyncio.run(run_scenario(name, events, args))
+        r = results[name]
+        written = "n/a" if r["bytes_written"] is None else f"{r['bytes_written'] / 1024:.1f} KiB"
+        print(f"{name:<11} {r['events']:>7} events  {r['events_per_s']:>10.1f}/s  "
+              f"p50 {r['p50_ms']:.3f} ms  p99 {r['p99_ms']:.3f} ms  written {written}  "
+              f"REST {sum(r['rest_calls'].values())}")
+
+    output = {"args": {k: v for k, v in vars(args).items() if k not in ("json", "compare", "record")}, "scenarios": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare}:")
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,60 @@
+"""Measure time-to-ready and peak RSS for a bot profile against a live token.
+
+Run it once per profile in a fresh process and compare the two outputs:
+
+    DISCORD_TOKEN=... python bench/startup.py full
+    DISCORD_TOKEN=... python bench/startup.py lean
+
+Without a token, ``--offline`` stops after the bot is built and its
+extensions are loaded: that covers setup cost, intents and baseline memory,
+but not the gateway's READY or member caching.
+
+    python bench/startup.py lean --offline
+"""
+import asyncio
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import main  # noqa: E402
+
+
+async def measure(profile, offline=False):
+    started = time.perf_counter()
+    bot = await main.create_bot(profile)
+    result = {}
+    if offline:
+        result["built_s"] = time.perf_counter() - started
+        result["extensions_s"] = sum(sum(t.values()) for t in bot.extension_timings.values())
+        result["intents"] = bot.intents.value
+        result["member_cache"] = bot._connection.member_cache_flags.value
+        result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        await bot.storage.close()
+        await bot.close()
+        return result
+
+    @bot.listen()
+    async def on_ready():
+        result["ready_s"] = time.perf_counter() - started
+        result["extensions_s"] = sum(sum(t.values()) for t in bot.extension_timings.values())
+        result["guilds"] = len(bot.guilds)
+        result["cached_members"] = sum(len(g.members) for g in bot.guilds)
+        result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        await bot.close()
+
+    try:
+        async with bot:
+            await bot.start(os.environ["DISCORD_TOKEN"])
+    finally:
+        await bot.storage.close()
+    return result
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--offline"]
+    profile = args[0] if args else main.BOT_PROFILE
+    result = asyncio.run(measure(profile, "--offline" in sys.argv))
+    print(f"profile={profile} " + " ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in result.items()))
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import discord
+
+BULK_BAN_CHUNK = 200  # most users one bulk-ban request accepts
+
+
+class BulkStats:
+    __slots__ = ("total", "done", "failed")
+
+    def __init__(self, total):
+        self.total = total
+        self.done = []  # IDs acted on
+        self.failed = []
+
+    @property
+    def processed(self):
+        return len(self.done) + len(self.failed)
+
+
+async def run_bulk(targets, action, stats=None, concurrency=5, on_progress=None, progress_interval=3.0):
+    """Await ``action(target)`` for every target, at most ``concurrency`` at a time.
+
+    A target fails if its action raises ``discord.HTTPException`` or returns
+    False. discord.py already waits out 429s per route; the lane keeps a
+    burst of hundreds of calls from piling onto the same bucket at once.
+    ``on_progress(stats)`` is awaited at most every ``progress_interval``
+    seconds.
+    """
+    if stats is None:
+        stats = BulkStats(len(targets))
+    lane = asyncio.Semaphore(concurrency)
+    last_report = time.monotonic()
+
+    async def run_one(target):
+        nonlocal last_report
+        async with lane:
+            try:
+                ok = await action(target) is not False
+            except discord.HTTPException:
+                ok = False
+        (stats.done if ok else stats.failed).append(target.id)
+        if on_progress is not None and time.monotonic() - last_report >= progress_interval:
+            last_report = time.monotonic()
+            await on_progress(stats)
+
+    await asyncio.gather(*(run_one(t) for t in targets))
+    return stats
+
+
+async def bulk_ban(guild, users, reason=None, concurrency=5, on_progress=None):
+    """Ban ``users`` through the bulk-ban endpoint, 200 per request.
+
+    Chunks the endpoint rejects, and everything when the bot lacks Manage
+    Server (which bulk bans also need) or the library predates them, fall
+    back to single bans through ``run_bulk``.
+    """
+    stats = BulkStats(len(users))
+    singles = []
+    if not hasattr(guild, "bulk_ban"):
+        singles = list(users)
+        users = []
+    for start in range(0, len(users), BULK_BAN_CHUNK):
+        chunk = users[start:start + BULK_BAN_CHUNK]
+        try:
+            result = await guild.bulk_ban(chunk, reason=reason)
+        except discord.Forbidden:
+            singles.extend(users[start:])
+            break
+        except discord.HTTPException:
+            singles.extend(chunk)
+            continue
+        stats.done.extend(u.id for u in result.banned)
+        stats.failed.extend(u.id for u in result.failed)
+        if on_progress is not None:
+            await on_progress(stats)
+    if singles:
+        await run_bulk(singles, lambda u: guild.ban(u, reason=reason), stats, concurrency, on_progress)
+    return stats
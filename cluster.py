@@ -0,0 +1,149 @@
+"""Run the bot as several processes ("clusters"), each owning a range of shards.
+
+    DISCORD_TOKEN=... python cluster.py --clusters 4
+    DISCORD_TOKEN=... python cluster.py --clusters 4 --shards 16
+
+Each cluster gets its own DATA_DIR (data/cluster-<n>) and on first start
+imports only its own guilds from the legacy JSON files. IP bans are global, so
+they live in data/shared.db, which every cluster opens. Clusters need the
+SQLite backend; the JSON one can't share or import anything. The supervisor restarts clusters that crash, backing off
+if they keep failing.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+
+import aiohttp
+
+RESTART_BACKOFF_MAX = 300
+STABLE_AFTER = 60
+
+
+def fetch_recommended_shards(token):
+    async def fetch():
+        headers = {"Authorization": f"Bot {token}"}
+        async with aiohttp.ClientSession(headers=headers) as session:
+            async with session.get("https://discord.com/api/v10/gateway/bot") as resp:
+                resp.raise_for_status()
+                return (await resp.json())["shards"]
+
+    return asyncio.run(fetch())
+
+
+def run_cluster(cluster_id, shard_ids, shard_count, data_root):
+    os.environ["CLUSTER_ID"] = str(cluster_id)
+    os.environ["SHARD_IDS"] = ",".join(map(str, shard_ids))
+    os.environ["SHARD_COUNT"] = str(shard_count)
+    os.environ["DATA_DIR"] = os.path.join(data_root, f"cluster-{cluster_id}")
+    os.environ["SHARED_DATA_DIR"] = data_root
+    import main  # imported after the environment is set; main reads it at import time
+
+    asyncio.run(main.main())
+
+
+class Cluster:
+    def __init__(self, cluster_id, shard_ids, shard_count, data_root):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.data_root = data_root
+        self.process = None
+        self.started_at = 0.0
+        self.backoff = 1
+        self.restart_at = None
+
+    def start(self):
+        ctx = multiprocessing.get_context("spawn")
+        self.process = ctx.Process(
+            target=run_cluster,
+            args=(self.cluster_id, self.shard_ids, self.shard_count, self.data_root),
+            name=f"cluster-{self.cluster_id}",
+        )
+        self.process.start()
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        print(f"[cluster] Started cluster {self.cluster_id} (shards {self.shard_ids[0]}-{self.shard_ids[-1]}, pid {self.process.pid})")
+
+
+def supervise(clusters, stagger):
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for cluster in clusters:
+        cluster.start()
+        # Identify is rate limited per bot, so give each cluster's shards time to connect.
+        deadline = time.monotonic() + stagger * len(cluster.shard_ids)
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(0.5)
+        if stopping:
+            break
+
+    while not stopping:
+        now = time.monotonic()
+        for cluster in clusters:
+            proc = cluster.process
+            if proc is None or proc.is_alive():
+                continue
+            if cluster.restart_at is None:
+                if proc.exitcode == 0:
+                    print(f"[cluster] Cluster {cluster.cluster_id} exited cleanly; not restarting.")
+                    cluster.process = None
+                    continue
+                if now - cluster.started_at > STABLE_AFTER:
+                    cluster.backoff = 1
+                print(f"[cluster] Cluster {cluster.cluster_id} died (exit {proc.exitcode}); restarting in {cluster.backoff}s.")
+                cluster.restart_at = now + cluster.backoff
+                cluster.backoff = min(cluster.backoff * 2, RESTART_BACKOFF_MAX)
+            elif now >= cluster.restart_at:
+                cluster.start()
+        if all(c.process is None for c in clusters):
+            return
+        time.sleep(1)
+
+    for cluster in clusters:
+        if cluster.process is not None and cluster.process.is_alive():
+            cluster.process.terminate()
+    for cluster in clusters:
+        if cluster.process is not None:
+            cluster.process.join(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1, help="number of processes")
+    parser.add_argument("--shards", type=int, default=0, help="total shards (default: Discord's recommendation)")
+    parser.add_argument("--data-root", default="data", help="parent directory of per-cluster data dirs")
+    parser.add_argument("--stagger", type=float, default=5.0, help="seconds to wait per shard before starting the next cluster")
+    args = parser.parse_args()
+
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        print("ERROR: Please set your DISCORD_TOKEN environment variable.")
+        return
+    if os.getenv("STORAGE_BACKEND", "sqlite") != "sqlite":
+        print("ERROR: Clusters need STORAGE_BACKEND=sqlite; the JSON backend would start each cluster empty.")
+        return
+    shard_count = args.shards or fetch_recommended_shards(token)
+    cluster_count = max(1, min(args.clusters, shard_count))
+    per_cluster, extra = divmod(shard_count, cluster_count)
+    clusters = []
+    first = 0
+    for cluster_id in range(cluster_count):
+        size = per_cluster + (1 if cluster_id < extra else 0)
+        clusters.append(Cluster(cluster_id, list(range(first, first + size)), shard_count, args.data_root))
+        first += size
+    print(f"[cluster] {shard_count} shards across {cluster_count} clusters")
+    supervise(clusters, args.stagger)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import discord
+from discord.ext import commands
+import os
+import asyncio
+from datetime import datetime, timezone
+from activity import ActivityTracker
+from extensions import stash, unstash
+from members import Member
+
+# Presence tracking (opt-in per guild with ,trackactivity): hard cap on members held in memory.
+ACTIVITY_MAX_MEMBERS = int(os.getenv("ACTIVITY_MAX_MEMBERS", "50000"))
+ACTIVITY_ROLLUP_INTERVAL = 300  # seconds between writes of presence aggregates
+
+def format_duration(seconds):
+    minutes, _ = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+class ActivityWatcher(commands.Cog):
+    """Per-member online time, status changes and activities.
+
+    Loading this cog makes the lean profile request the privileged presences
+    intent, so Discord sends every presence change in every guild; that is
+    usually the largest share of gateway traffic, and ``,trackactivity`` only
+    decides which of those events are kept. It isn't loaded by default: add
+    ``activity_watcher`` to EXTENSIONS where the tracking is wanted.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.watch_data = {}
+        self.tracker = ActivityTracker(ACTIVITY_MAX_MEMBERS)
+        self.enabled = set()
+        self.rollup_task = None
+        self.early_rollup = None
+
+    async def cog_load(self):
+        settings = await self.bot.storage.get_documents("activity_settings")
+        self.enabled = {int(guild_id) for guild_id, config in settings.items() if config.get("enabled")}
+        carried = unstash(self.bot, self)
+        if carried:
+            # Live statuses survive a reload; their totals were already rolled up on unload.
+            self.tracker = carried["tracker"]
+        self.rollup_task = asyncio.create_task(self.rollup_loop())
+
+    async def cog_unload(self):
+        if self.rollup_task:
+            self.rollup_task.cancel()
+        await self.rollup()
+        stash(self.bot, self, tracker=self.tracker)
+
+    async def rollup_loop(self):
+        while True:
+            await asyncio.sleep(ACTIVITY_ROLLUP_INTERVAL)
+            await self.rollup()
+
+    async def rollup(self):
+        changes = self.tracker.collect()
+        if not changes:
+            return
+        try:
+            await self.bot.storage.update_documents(
+                "activity", {f"{g}:{u}": delta for (g, u), delta in changes.items()}, self.tracker.merge
+            )
+        except Exception as e:
+            self.tracker.restore(changes)
+            print(f"[activity] Failed to save activity for {len(changes)} members: {e}")
+
+    @commands.Cog.listener()
+    async def on_raw_presence_update(self, payload):
+        # Raw so presences arrive even for members the lean profile doesn't cache.
+        if payload.guild_id not in self.enabled:
+            return
+        activity = next((a.name for a in payload.activities if a.type is not discord.ActivityType.custom and a.name), None)
+        self.tracker.update(payload.guild_id, payload.user_id, str(payload.client_status.status), activity)
+        if self.tracker.backlogged and (self.early_rollup is None or self.early_rollup.done()):
+            self.early_rollup = asyncio.create_task(self.rollup())
+
+    @commands.command(help="Show a member's tracked online time, status changes and top activities.")
+    @commands.guild_only()
+    async def watch(self, ctx, member: Member = None):
+        member = member or ctx.author
+        note = self.watch_data.get(str(member.id))
+        stored = await self.bot.storage.get_document("activity", f"{ctx.guild.id}:{member.id}")
+        stats = self.tracker.snapshot(ctx.guild.id, member.id, stored)
+        if not note and not stats:
+            return await ctx.send(f"⚠️ No watch data found for {member.display_name}.")
+        embed = discord.Embed(title=f"👀 Watching {member.display_name}", description=note, color=discord.Color.teal())
+        if stats:
+            embed.add_field(name="Status", value=f"{stats['status']} since <t:{stats['changed_at']}:R>")
+            embed.add_field(name="Online", value=format_duration(stats["online"]))
+            embed.add_field(name="Status changes", value=str(stats["transitions"]))
+            top = sorted(stats["activities"].items(), key=lambda item: item[1], reverse=True)[:5]
+            embed.add_field(
+                name="Top activities",
+                value="\n".join(f"{name} — {format_duration(seconds)}" for name, seconds in top) or "None yet",
+                inline=False,
+            )
+            recent = "\n".join(f"<t:{ts}:f> → {status}" for ts, status in reversed(stats["history"][-5:]))
+            embed.add_field(name="Recent changes", value=recent or "None yet", inline=False)
+            embed.set_footer(text=f"Last seen {datetime.fromtimestamp(stats['last_seen'], timezone.utc):%Y-%m-%d %H:%M} UTC")
+        await ctx.send(embed=embed)
+
+    @commands.command()
+    async def setwatch(self, ctx, *, info: str):
+        self.watch_data[str(ctx.author.id)] = info
+        await ctx.send(f"✅ Watch info set for {ctx.author.display_name}: {info}")
+
+    @commands.command(help="Turn presence tracking for this server on or off.")
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def trackactivity(self, ctx, enabled: bool):
+        if enabled:
+            self.enabled.add(ctx.guild.id)
+        else:
+            self.enabled.discard(ctx.guild.id)
+            self.tracker.forget_guild(ctx.guild.id)
+        await self.bot.storage.set_document("activity_settings", ctx.guild.id, {"enabled": enabled})
+        await ctx.send(f"✅ Activity tracking {'enabled' if enabled else 'disabled'} for this server.")
+
+async def setup(bot):
+    await bot.add_cog(ActivityWatcher(bot))
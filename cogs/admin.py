@@ -0,0 +1,82 @@
+import discord
+from discord.ext import commands
+from io import BytesIO
+import time
+from tracing import sample_profile
+from extensions import qualified
+
+MAX_PROFILE_SECONDS = 60
+
+class Admin(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_check(self, ctx):
+        return await self.bot.is_owner(ctx.author)
+
+    @commands.command(name="pipeline")
+    async def pipeline_stats(self, ctx):
+        embed = discord.Embed(title="🧵 Message Pipeline", color=discord.Color.blurple())
+        for order, name in self.bot.pipeline.stages:
+            stats = self.bot.pipeline.stats[name]
+            avg = stats.total / stats.calls * 1000 if stats.calls else 0
+            embed.add_field(
+                name=f"{order} • {name}",
+                value=f"{stats.calls} calls • avg {avg:.2f} ms • worst {stats.worst * 1000:.2f} ms",
+                inline=False,
+            )
+        await ctx.send(embed=embed)
+
+    @commands.command(help="Show recent command and listener latency (p50/p99/worst).")
+    async def latency(self, ctx):
+        embed = discord.Embed(title="⏱️ Latency", color=discord.Color.blurple())
+        monitor = self.bot.loop_monitor
+        embed.description = (
+            f"Event loop lag: last {monitor.last_lag * 1000:.1f} ms • worst {monitor.worst_lag * 1000:.1f} ms "
+            f"• stalls {monitor.stalls}"
+        )
+        for kind, title in (("command", "Commands"), ("listener", "Listeners")):
+            rows = self.bot.tracker.summary(kind)[:10]
+            lines = [
+                f"`{name}` {count}× • p50 {p50 * 1000:.1f} • p99 {p99 * 1000:.1f} • worst {worst * 1000:.1f} ms"
+                for name, count, p50, p99, worst in rows
+            ]
+            embed.add_field(name=title, value="\n".join(lines)[:1024] or "No samples yet.", inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(help="Sample the running bot's stacks for a few seconds and upload the hottest ones.")
+    async def profile(self, ctx, seconds: float = 10.0):
+        seconds = max(1.0, min(seconds, MAX_PROFILE_SECONDS))
+        await ctx.send(f"🔬 Profiling for {seconds:.0f}s...")
+        report = await sample_profile(seconds)
+        await ctx.send(
+            "📄 Profile summary:",
+            file=discord.File(BytesIO(report.encode()), filename="profile.txt"),
+        )
+
+    @commands.command(help="Reload an extension from the cogs package without restarting the bot.")
+    async def reload(self, ctx, name: str):
+        started = time.perf_counter()
+        try:
+            await self.bot.reload_extension(qualified(name))
+        except commands.ExtensionError as e:
+            await ctx.send(f"❌ Failed to reload `{name}`: {e}")
+            return
+        elapsed = time.perf_counter() - started
+        self.bot.extension_timings.setdefault(name.removeprefix("cogs."), {})["reload"] = elapsed
+        await ctx.send(f"🔄 Reloaded `{name}` in {elapsed * 1000:.1f} ms.")
+
+    @commands.command(help="List loaded extensions with their import, setup and last reload times.")
+    async def extensions(self, ctx):
+        embed = discord.Embed(title="🧩 Extensions", color=discord.Color.blurple())
+        lines = []
+        for module in self.bot.extensions:
+            name = module.removeprefix("cogs.")
+            timing = self.bot.extension_timings.get(name, {})
+            parts = [f"{kind} {timing[kind] * 1000:.1f} ms" for kind in ("import", "setup", "reload") if kind in timing]
+            lines.append(f"`{name}` {' • '.join(parts)}")
+        embed.description = "\n".join(lines) or "No extensions loaded."
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,97 @@
+import discord
+from discord.ext import commands
+from wordfilter import WordMatcher
+import pipeline
+import outbound
+
+DEFAULT_BANNED_WORDS = ["badword1", "badword2"]  # used until a guild configures its own list
+
+class AutoMod(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.words = {}
+        self.matchers = {}
+
+    async def cog_load(self):
+        self.words = await self.bot.storage.get_documents("automod_words")
+        self.bot.pipeline.register(pipeline.FILTER, "automod", self.check_message)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("automod")
+
+    def get_words(self, guild_id):
+        return self.words.get(str(guild_id), DEFAULT_BANNED_WORDS)
+
+    def get_matcher(self, guild_id):
+        # Compiled once per guild and dropped whenever that guild's list changes.
+        guild_id = str(guild_id)
+        matcher = self.matchers.get(guild_id)
+        if matcher is None:
+            matcher = self.matchers[guild_id] = WordMatcher(self.get_words(guild_id))
+        return matcher
+
+    async def set_words(self, guild_id, words):
+        guild_id = str(guild_id)
+        self.words[guild_id] = sorted(words)
+        self.matchers.pop(guild_id, None)
+        await self.bot.storage.set_document("automod_words", guild_id, self.words[guild_id])
+
+    async def check_message(self, ctx):
+        message = ctx.message
+        if self.get_matcher(message.guild.id).search(ctx.normalized):
+            ctx.stop()
+            await message.delete()
+            self.bot.outbound.send(
+                message.channel, f"⚠️ {message.author.mention}, that word is not allowed here!",
+                priority=outbound.NOTICE, delete_after=5,
+            )
+
+    @commands.group(name="filter", invoke_without_command=True)
+    @commands.has_permissions(administrator=True)
+    async def filter_(self, ctx):
+        await ctx.send("Usage: `,filter add <words...>`, `,filter remove <words...>`, `,filter list`, `,filter clear`")
+
+    @filter_.command(name="add")
+    @commands.has_permissions(administrator=True)
+    async def filter_add(self, ctx, *words: str):
+        if not words:
+            return await ctx.send("❌ Provide at least one word to add.")
+        current = set(self.get_words(ctx.guild.id))
+        added = {w.lower() for w in words} - current
+        await self.set_words(ctx.guild.id, current | added)
+        await ctx.send(f"✅ Added {len(added)} word(s) to the filter ({len(current) + len(added)} total).")
+
+    @filter_.command(name="remove")
+    @commands.has_permissions(administrator=True)
+    async def filter_remove(self, ctx, *words: str):
+        current = set(self.get_words(ctx.guild.id))
+        removed = current & {w.lower() for w in words}
+        if not removed:
+            return await ctx.send("❌ None of those words are in the filter.")
+        await self.set_words(ctx.guild.id, current - removed)
+        await ctx.send(f"✅ Removed {len(removed)} word(s) from the filter.")
+
+    @filter_.command(name="list")
+    @commands.has_permissions(administrator=True)
+    async def filter_list(self, ctx):
+        words = self.get_words(ctx.guild.id)
+        if not words:
+            return await ctx.send("✅ The filter is empty.")
+        listing = ", ".join(f"`{w}`" for w in words)
+        if len(listing) > 4000:
+            listing = listing[:4000] + "…"
+        embed = discord.Embed(title=f"🚫 Filtered Words ({len(words)})", description=listing, color=discord.Color.red())
+        try:
+            await ctx.author.send(embed=embed)
+            await ctx.send("📬 Sent the filter list to your DMs.")
+        except discord.Forbidden:
+            await ctx.send("❌ Couldn't DM you the filter list.")
+
+    @filter_.command(name="clear")
+    @commands.has_permissions(administrator=True)
+    async def filter_clear(self, ctx):
+        await self.set_words(ctx.guild.id, [])
+        await ctx.send("✅ Cleared the filter.")
+
+async def setup(bot):
+    await bot.add_cog(AutoMod(bot))
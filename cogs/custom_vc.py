@@ -0,0 +1,101 @@
+import discord
+from discord.ext import commands
+import asyncio
+
+TEMP_VC_DELETE_DELAY = 15  # seconds an empty custom VC survives, so quick rejoins keep it
+
+class CustomVC(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.temp_channels = {}  # guild_id -> {channel_id: owner_id}
+        self.pending_deletes = {}  # channel_id -> task
+        self.reconcile_task = None
+
+    async def cog_load(self):
+        stored = await self.bot.storage.get_documents("temp_vcs")
+        self.temp_channels = {
+            int(guild_id): {int(vc_id): owner_id for vc_id, owner_id in channels.items()}
+            for guild_id, channels in stored.items()
+        }
+        self.reconcile_task = asyncio.create_task(self.reconcile())
+
+    async def cog_unload(self):
+        if self.reconcile_task:
+            self.reconcile_task.cancel()
+        for task in self.pending_deletes.values():
+            task.cancel()
+
+    async def save(self, guild_id):
+        channels = self.temp_channels.get(guild_id)
+        if channels:
+            await self.bot.storage.set_document("temp_vcs", guild_id, {str(c): o for c, o in channels.items()})
+        else:
+            self.temp_channels.pop(guild_id, None)
+            await self.bot.storage.delete_document("temp_vcs", guild_id)
+
+    async def reconcile(self):
+        # Channels created before a restart: forget deleted ones, clean up empty ones.
+        await self.bot.wait_until_ready()
+        for guild_id, channels in list(self.temp_channels.items()):
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                continue
+            for vc_id in list(channels):
+                vc = guild.get_channel(vc_id)
+                if vc is None:
+                    channels.pop(vc_id)
+                elif not vc.members:
+                    self.schedule_delete(vc)
+            await self.save(guild_id)
+
+    def schedule_delete(self, vc):
+        if vc.id not in self.pending_deletes:
+            self.pending_deletes[vc.id] = asyncio.create_task(self.delete_later(vc.guild.id, vc.id))
+
+    async def delete_later(self, guild_id, vc_id):
+        try:
+            await asyncio.sleep(TEMP_VC_DELETE_DELAY)
+            guild = self.bot.get_guild(guild_id)
+            vc = guild.get_channel(vc_id) if guild else None
+            if vc is not None and vc.members:
+                return
+            if vc is not None:
+                try:
+                    await vc.delete()
+                except discord.NotFound:
+                    pass
+            self.temp_channels.get(guild_id, {}).pop(vc_id, None)
+            await self.save(guild_id)
+        finally:
+            if self.pending_deletes.get(vc_id) is asyncio.current_task():
+                self.pending_deletes.pop(vc_id)
+
+    @commands.command()
+    async def createvc(self, ctx, *, name="Private VC"):
+        category = discord.utils.get(ctx.guild.categories, name="Custom VCs")
+        if not category:
+            category = await ctx.guild.create_category("Custom VCs")
+        vc = await ctx.guild.create_voice_channel(name, category=category)
+        await vc.set_permissions(ctx.author, manage_channels=True)
+        self.temp_channels.setdefault(ctx.guild.id, {})[vc.id] = ctx.author.id
+        await self.save(ctx.guild.id)
+        # Nobody is in it yet; joining within the delay cancels this like any other empty channel.
+        self.schedule_delete(vc)
+        await ctx.send(f"🎙️ Created custom voice channel: **{vc.name}**")
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if before.channel == after.channel:
+            return
+        channels = self.temp_channels.get(member.guild.id)
+        if not channels:
+            return
+        if after.channel and after.channel.id in channels:
+            task = self.pending_deletes.pop(after.channel.id, None)
+            if task:
+                task.cancel()
+        if before.channel and before.channel.id in channels and not before.channel.members:
+            self.schedule_delete(before.channel)
+
+async def setup(bot):
+    await bot.add_cog(CustomVC(bot))
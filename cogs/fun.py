@@ -0,0 +1,147 @@
+import discord
+from discord.ext import commands
+import asyncio
+import random
+from io import BytesIO
+from imaging import ImageConverter, ImageTooLarge, ConverterBusy
+from members import Member
+
+class Fun(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.converter = ImageConverter()
+
+    async def cog_unload(self):
+        self.converter.close()
+
+    @commands.command()
+    async def joke(self, ctx):
+        jokes = [
+            "Why don’t skeletons fight each other? They don’t have the guts.",
+            "I told my computer I needed a break, and it said 'No problem, I’ll go to sleep.'",
+            "Why was the math book sad? Because it had too many problems.",
+            "I'm reading a book about anti-gravity. It's impossible to put down!"
+        ]
+        await ctx.send(random.choice(jokes))
+
+    @commands.command(aliases=['8ball'])
+    async def eightball(self, ctx, *, question):
+        responses = [
+            "Yes.", "No.", "Maybe.", "Ask again later.", "Definitely!", "Absolutely not.",
+            "I wouldn’t count on it.", "It is certain.", "Very doubtful."
+        ]
+        await ctx.send(f"🎱 {random.choice(responses)}")
+
+    @commands.command()
+    async def rizz(self, ctx, member: Member = None):
+        member = member or ctx.author
+        score = random.randint(0, 100)
+        await ctx.send(f"💅 {member.display_name} has **{score}%** rizz!")
+
+    @commands.command()
+    async def flip(self, ctx):
+        await ctx.send(f"🪙 The coin landed on **{random.choice(['Heads', 'Tails'])}**!")
+
+    @commands.command()
+    async def roll(self, ctx, sides: int = 6):
+        if sides < 2:
+            return await ctx.send("🎲 Dice must have at least 2 sides!")
+        await ctx.send(f"🎲 You rolled a **{random.randint(1, sides)}** on a {sides}-sided die!")
+
+    @commands.command()
+    async def roast(self, ctx, member: Member = None):
+        member = member or ctx.author
+        roasts = [
+            f"{member.display_name}, you bring everyone so much joy... when you leave the room.",
+            f"{member.display_name}, your secrets are always safe with me. I never even listen.",
+            f"{member.display_name}, you're like a cloud. When you disappear, it’s a beautiful day.",
+        ]
+        await ctx.send(random.choice(roasts))
+
+    @commands.command()
+    async def compliment(self, ctx, member: Member = None):
+        member = member or ctx.author
+        compliments = [
+            "You’re like sunshine on a rainy day.",
+            "You're the reason the internet exists.",
+            "You're cooler than a polar bear in sunglasses.",
+            "You light up Discord like nobody else."
+        ]
+        await ctx.send(f"💖 {member.mention}, {random.choice(compliments)}")
+
+    @commands.command()
+    async def saydumb(self, ctx):
+        dumb_things = [
+            "I put my AirPods in a glass of water to charge them with hydration.",
+            "I use dark mode to save ink.",
+            "I microwave my phone to charge it faster.",
+            "I turn off Wi-Fi to let the signal rest."
+        ]
+        await ctx.send(random.choice(dumb_things))
+
+    @commands.command()
+    async def mathmeme(self, ctx):
+        memes = [
+            "Math teachers be like: 'Assume the ladder is frictionless and infinite.'",
+            "x = -b ± √(b² - 4ac) / 2a = Stress",
+            "When you finally solve a problem and the answer is nowhere near the options.",
+        ]
+        await ctx.send(f"📐 {random.choice(memes)}")
+
+    @commands.command()
+    async def rate(self, ctx, *, thing: str):
+        await ctx.send(f"I'd rate **{thing}** a solid **{random.randint(1,10)}/10**!")
+
+    @commands.command()
+    async def hacker(self, ctx, target: Member = None):
+        target = target or ctx.author
+        fake_ip = f"{random.randint(10, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}"
+        await ctx.send(f"💻 Hacking {target.display_name}...\nIP FOUND: `{fake_ip}`\nAccessing messages... 💾\nDownload complete ✔️")
+
+    @commands.command()
+    async def rps(self, ctx, choice: str):
+        user = choice.lower()
+        bot_choice = random.choice(["rock", "paper", "scissors"])
+        win = {"rock": "scissors", "paper": "rock", "scissors": "paper"}
+        if user not in win:
+            return await ctx.send("Please choose rock, paper, or scissors.")
+        if user == bot_choice:
+            result = "It's a tie!"
+        elif win[user] == bot_choice:
+            result = "You win!"
+        else:
+            result = "I win!"
+        await ctx.send(f"You chose **{user}**, I chose **{bot_choice}**. {result}")
+
+    @commands.command()
+    async def emoji(self, ctx):
+        emojis = ['😂', '🔥', '💀', '💯', '👀', '😎', '🥶', '😭', '😤']
+        await ctx.send(random.choice(emojis))
+
+    @commands.command()
+    async def spamemoji(self, ctx):
+        emojis = ['😂', '🔥', '💀', '💯', '👀', '😎', '🥶', '😭', '😤']
+        await ctx.send(" ".join(random.choices(emojis, k=20)))
+
+    @commands.command(name="to_gif", help="Convert an uploaded image to a GIF")
+    async def to_gif(self, ctx):
+        if not ctx.message.attachments:
+            return await ctx.send("❌ Please attach an image to convert.")
+        attachment = ctx.message.attachments[0]
+        if not any(attachment.filename.lower().endswith(ext) for ext in ['png', 'jpg', 'jpeg', 'bmp', 'gif', 'webp', 'apng']):
+            return await ctx.send("❌ Unsupported file type. Please upload a PNG, JPG, BMP, GIF or WebP image.")
+        if attachment.size > self.converter.max_bytes:
+            return await ctx.send(f"❌ That file is too large. The limit is {self.converter.max_bytes // (1024 * 1024)} MB.")
+        try:
+            image_bytes = await attachment.read()
+            gif = await self.converter.to_gif(image_bytes)
+            await ctx.send(file=discord.File(fp=BytesIO(gif), filename="converted.gif"))
+        except (ImageTooLarge, ConverterBusy) as e:
+            await ctx.send(f"❌ {e}")
+        except asyncio.TimeoutError:
+            await ctx.send("❌ Converting that image took too long.")
+        except Exception as e:
+            await ctx.send(f"❌ Failed to convert image: {e}")
+
+async def setup(bot):
+    await bot.add_cog(Fun(bot))
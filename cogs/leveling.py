@@ -0,0 +1,175 @@
+import discord
+from discord.ext import commands
+from typing import Optional
+import os
+import asyncio
+import random
+from persistence import WriteBehindBuffer
+from ranking import RankingIndex
+from cooldown import CooldownTable
+import pipeline
+from extensions import stash, unstash
+from members import Member
+
+# Durability window for XP: at most this many seconds (or this many changes) can be lost on a crash.
+LEVELS_FLUSH_INTERVAL = float(os.getenv("LEVELS_FLUSH_INTERVAL", "5"))
+LEVELS_FLUSH_THRESHOLD = int(os.getenv("LEVELS_FLUSH_THRESHOLD", "500"))
+# One XP award per user per window; guilds override it with ,xpcooldown.
+XP_COOLDOWN_SECONDS = float(os.getenv("XP_COOLDOWN_SECONDS", "60"))
+MAX_XP_COOLDOWN = 86400
+LEADERBOARD_PAGE_SIZE = 10
+
+class Leveling(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.store = WriteBehindBuffer(bot.storage.save_levels, LEVELS_FLUSH_INTERVAL, LEVELS_FLUSH_THRESHOLD)
+        self.levels = self.store.data
+        self.rankings = {}
+        self.settings = {}
+        self.cooldowns = {}
+
+    async def cog_load(self):
+        carried = unstash(self.bot, self)
+        if carried:
+            # Reloaded: the previous instance flushed on unload, so its XP and indexes are current.
+            self.levels.update(carried["levels"])
+            self.rankings = carried["rankings"]
+            self.cooldowns = carried["cooldowns"]
+        else:
+            self.levels.update(await self.bot.storage.load_levels())
+        self.settings = await self.bot.storage.get_documents("leveling_settings")
+        self.store.start()
+        self.bot.pipeline.register(pipeline.XP, "leveling", self.award_xp)
+
+    async def cog_unload(self):
+        self.bot.pipeline.unregister("leveling")
+        await self.store.close()
+        stash(self.bot, self, levels=self.levels, rankings=self.rankings, cooldowns=self.cooldowns)
+
+    def get_xp(self, guild_id, user_id):
+        return self.levels.get(str(guild_id), {}).get(str(user_id), 0)
+
+    def set_xp(self, guild_id, user_id, xp):
+        self.levels.setdefault(str(guild_id), {})[str(user_id)] = xp
+        self.store.mark_dirty(guild_id, user_id)
+        ranking = self.rankings.get(str(guild_id))
+        if ranking is not None:
+            ranking.update(user_id, xp)
+
+    def get_ranking(self, guild_id):
+        # Built on first use, then kept current by set_xp.
+        guild_id = str(guild_id)
+        ranking = self.rankings.get(guild_id)
+        if ranking is None:
+            ranking = self.rankings[guild_id] = RankingIndex(self.levels.get(guild_id))
+        return ranking
+
+    def get_cooldown(self, guild_id):
+        table = self.cooldowns.get(guild_id)
+        if table is None:
+            window = self.settings.get(str(guild_id), {}).get("cooldown", XP_COOLDOWN_SECONDS)
+            table = self.cooldowns[guild_id] = CooldownTable(window)
+        return table
+
+    def xp_to_level(self, xp):
+        return int((xp / 50) ** 0.5)
+
+    def level_to_xp(self, level):
+        return 50 * (level ** 2)
+
+    async def award_xp(self, ctx):
+        message = ctx.message
+        if not self.get_cooldown(message.guild.id).try_acquire(message.author.id):
+            return
+        guild_id = str(message.guild.id)
+        user_id = str(message.author.id)
+        current_xp = self.get_xp(guild_id, user_id)
+        current_level = self.xp_to_level(current_xp)
+        xp_gain = random.randint(5, 15)
+        new_xp = current_xp + xp_gain
+        new_level = self.xp_to_level(new_xp)
+        self.set_xp(guild_id, user_id, new_xp)
+        if new_level > current_level:
+            self.bot.outbound.send(message.channel, f"🎉 Congrats {message.author.mention}, you leveled up to level **{new_level}**!")
+
+    @commands.command()
+    async def level(self, ctx, member: Member = None):
+        member = member or ctx.author
+        guild_id = str(ctx.guild.id)
+        user_id = str(member.id)
+        xp = self.get_xp(guild_id, user_id)
+        level = self.xp_to_level(xp)
+        await ctx.send(f"⭐ {member.display_name} is level {level} with {xp} XP.")
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def addlevel(self, ctx, member: Member, levels: int):
+        if levels < 1:
+            return await ctx.send("❌ Levels to add must be at least 1.")
+        guild_id = str(ctx.guild.id)
+        user_id = str(member.id)
+        current_xp = self.get_xp(guild_id, user_id)
+        current_level = self.xp_to_level(current_xp)
+        new_level = current_level + levels
+        new_xp = self.level_to_xp(new_level)
+        self.set_xp(guild_id, user_id, new_xp)
+        await ctx.send(f"✅ Added {levels} levels to {member.display_name}. Now level {new_level}.")
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def removelevel(self, ctx, member: Member, levels: int):
+        if levels < 1:
+            return await ctx.send("❌ Levels to remove must be at least 1.")
+        guild_id = str(ctx.guild.id)
+        user_id = str(member.id)
+        current_xp = self.get_xp(guild_id, user_id)
+        current_level = self.xp_to_level(current_xp)
+        new_level = max(0, current_level - levels)
+        new_xp = self.level_to_xp(new_level)
+        self.set_xp(guild_id, user_id, new_xp)
+        await ctx.send(f"✅ Removed {levels} levels from {member.display_name}. Now level {new_level}.")
+
+    @commands.command(help="Show or set how many seconds a member waits between XP awards (0 disables).")
+    @commands.has_permissions(administrator=True)
+    async def xpcooldown(self, ctx, seconds: Optional[float] = None):
+        table = self.get_cooldown(ctx.guild.id)
+        if seconds is None:
+            return await ctx.send(f"⏱️ XP cooldown is **{table.window:g}s**.")
+        if seconds < 0 or seconds > MAX_XP_COOLDOWN:
+            return await ctx.send(f"❌ Cooldown must be between 0 and {MAX_XP_COOLDOWN} seconds.")
+        table.window = seconds
+        guild_id = str(ctx.guild.id)
+        self.settings[guild_id] = {**self.settings.get(guild_id, {}), "cooldown": seconds}
+        await self.bot.storage.set_document("leveling_settings", guild_id, self.settings[guild_id])
+        await ctx.send(f"✅ XP cooldown set to **{seconds:g}s**.")
+
+    @commands.command()
+    async def rank(self, ctx, member: Member = None):
+        member = member or ctx.author
+        ranking = self.get_ranking(ctx.guild.id)
+        position = ranking.rank(member.id)
+        if position is None:
+            return await ctx.send(f"⚠️ {member.display_name} isn't ranked yet.")
+        xp = self.get_xp(ctx.guild.id, member.id)
+        await ctx.send(f"🏅 {member.display_name} is rank **#{position}** of {len(ranking)} (level {self.xp_to_level(xp)}, {xp} XP).")
+
+    @commands.command()
+    async def leaderboard(self, ctx, page: int = 1):
+        ranking = self.get_ranking(ctx.guild.id)
+        if not len(ranking):
+            return await ctx.send("No leveling data available.")
+        pages = (len(ranking) + LEADERBOARD_PAGE_SIZE - 1) // LEADERBOARD_PAGE_SIZE
+        if page < 1 or page > pages:
+            return await ctx.send(f"❌ Page must be between 1 and {pages}.")
+        rows = ranking.page(page, LEADERBOARD_PAGE_SIZE)
+        members = await asyncio.gather(*(self.bot.members.get(ctx.guild, user_id) for _, user_id, _ in rows))
+        embed = discord.Embed(title="🏆 Level Leaderboard", color=discord.Color.gold())
+        for (position, user_id, xp), member in zip(rows, members):
+            name = member.display_name if member else f"User ID {user_id}"
+            level = self.xp_to_level(xp)
+            embed.add_field(name=f"#{position} - {name}", value=f"Level {level} ({xp} XP)", inline=False)
+        embed.set_footer(text=f"Page {page}/{pages}")
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(Leveling(bot))
@@ -0,0 +1,715 @@
+import discord
+from discord.ext import commands
+from typing import Optional, Union
+import asyncio
+import os
+import re
+import tempfile
+import time
+from datetime import timedelta
+from modlog import ModLogDispatcher
+import audit
+from audit import AuditLog
+from purge import purge
+from bulk import run_bulk, bulk_ban
+from raid import JoinRateWindow, lock_channels, restore_channels
+from bans import BanIndex
+from ipbans import IPBanIndex
+from extensions import stash, unstash
+from members import Member
+
+MAX_BULK_UNBAN = 500
+PURGE_PROGRESS_THRESHOLD = 500  # purges at least this large post a live progress message
+MAX_MASS_ACTION = 1000
+MAX_TIMEOUT_MINUTES = 40320  # Discord's limit: 28 days
+MAX_RAID_WINDOW = 600  # seconds; also the size of each guild's join ring buffer
+HISTORY_PAGE_SIZE = 10
+IP_BANS_PAGE_SIZE = 15
+
+class PurgeFlags(commands.FlagConverter, prefix="--", delimiter=" "):
+    user: Optional[discord.User] = None
+    regex: Optional[str] = None
+    bots: bool = False
+    attachments: bool = False
+    before: Optional[int] = None
+    after: Optional[int] = None
+
+class MassFlags(commands.FlagConverter, prefix="--", delimiter=" "):
+    joined: Optional[int] = None  # minutes
+    regex: Optional[str] = None
+    reason: str = "No reason provided"
+
+class Moderation(commands.Cog):
+    # --joined/--regex scan the member list, which the lean profile only gets with this intent.
+    required_intents = ("members",)
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.modlog = ModLogDispatcher(bot)
+        self.audit = AuditLog(bot.storage)
+        self.ban_indexes = {}
+        self.ban_loads = {}
+        self.ip_index = IPBanIndex()
+        self.ip_index_load = None
+        self.raid_settings = {}  # guild_id -> {"joins": n, "seconds": s}
+        self.join_windows = {}
+        self.lockdowns = {}  # guild_id -> {channel_id: previous overwrite}
+        self.lockdown_locks = {}
+        self.lockdown_tasks = {}
+
+    async def cog_load(self):
+        settings = await self.bot.storage.get_documents("antiraid_settings")
+        self.raid_settings = {int(guild_id): config for guild_id, config in settings.items()}
+        lockdowns = await self.bot.storage.get_documents("lockdowns")
+        self.lockdowns = {int(guild_id): snapshot for guild_id, snapshot in lockdowns.items()}
+        carried = unstash(self.bot, self)
+        if carried:
+            self.ban_indexes = carried["ban_indexes"]
+            self.ip_index = carried["ip_index"]
+
+    async def cog_unload(self):
+        for task in self.lockdown_tasks.values():
+            task.cancel()
+        await self.modlog.close()
+        await self.audit.close()
+        stash(
+            self.bot, self,
+            ban_indexes={g: index for g, index in self.ban_indexes.items() if index.loaded},
+            ip_index=self.ip_index if self.ip_index.loaded else IPBanIndex(),
+        )
+
+    async def get_ban_index(self, guild):
+        # Fetched from the API once per guild, then kept current by the ban listeners.
+        index = self.ban_indexes.setdefault(guild.id, BanIndex())
+        if index.loaded:
+            return index
+        load = self.ban_loads.get(guild.id)
+        if load is None:
+            load = self.ban_loads[guild.id] = asyncio.create_task(self._load_bans(guild, index))
+        try:
+            await asyncio.shield(load)
+        finally:
+            if load.done():
+                self.ban_loads.pop(guild.id, None)
+        return index
+
+    async def _load_bans(self, guild, index):
+        async for entry in guild.bans(limit=None):
+            index.add(entry.user)
+        index.loaded = True
+
+    async def get_ip_index(self):
+        # Built from storage on first use, off the event loop: large lists take seconds to parse.
+        if not self.ip_index.loaded:
+            if self.ip_index_load is None:
+                self.ip_index_load = asyncio.create_task(self._load_ip_index())
+            try:
+                await asyncio.shield(self.ip_index_load)
+            finally:
+                if self.ip_index_load.done():
+                    self.ip_index_load = None
+        # Other clusters share the IP ban store; replay whatever they changed since the last look.
+        seq, changes = await self.bot.storage.ip_ban_changes(self.ip_index.seq)
+        if changes is None:
+            await self._load_ip_index()
+        else:
+            self.ip_index.apply(changes, seq)
+        return self.ip_index
+
+    async def _load_ip_index(self):
+        index = IPBanIndex()
+        index.seq, _ = await self.bot.storage.ip_ban_changes()
+        invalid = await asyncio.to_thread(index.load, await self.bot.storage.get_ip_bans())
+        if invalid:
+            print(f"[ipbans] Skipped {len(invalid)} stored IP bans that aren't addresses or ranges")
+        self.ip_index = index
+
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        index = self.ban_indexes.get(guild.id)
+        if index is not None:
+            index.add(user)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        index = self.ban_indexes.get(guild.id)
+        if index is not None:
+            index.remove(user.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.modlog.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.modlog.invalidate(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.name != after.name:
+            self.modlog.invalidate(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        guild = member.guild
+        settings = self.raid_settings.get(guild.id)
+        if settings is None:
+            return
+        window = self.join_windows.get(guild.id)
+        if window is None:
+            window = self.join_windows[guild.id] = JoinRateWindow(settings["seconds"])
+        joins = window.record()
+        if joins < settings["joins"] or guild.id in self.lockdowns:
+            return
+        task = self.lockdown_tasks.get(guild.id)
+        if task is None or task.done():
+            self.lockdown_tasks[guild.id] = asyncio.create_task(self.raid_lockdown(guild, joins, settings["seconds"]))
+
+    async def raid_lockdown(self, guild, joins, seconds):
+        reason = f"Anti-raid: {joins} joins in {seconds}s"
+        locked, failed, elapsed = await self.lock_guild(guild, reason)
+        embed = discord.Embed(title="🚨 Raid Lockdown", color=discord.Color.red(), timestamp=discord.utils.utcnow())
+        embed.add_field(name="Trigger", value=f"{joins} joins within {seconds} seconds", inline=False)
+        embed.add_field(name="Channels", value=f"{locked} locked in {elapsed:.1f}s" + (f", {failed} failed" if failed else ""), inline=False)
+        embed.set_footer(text="Lift it with ,unlockall")
+        self.modlog.enqueue(guild, embed)
+        self.audit.record(guild.id, "Lockdown", [(None, f"{locked} channels")], self.bot.user.id, reason)
+
+    async def lock_guild(self, guild, reason):
+        # Serialized per guild so the detector and ,lockall never snapshot a half-locked server.
+        async with self.lockdown_locks.setdefault(guild.id, asyncio.Lock()):
+            started = time.perf_counter()
+            snapshot, failed = await lock_channels(guild.text_channels, guild.default_role, reason)
+            if snapshot:
+                merged = self.lockdowns.setdefault(guild.id, {})
+                merged.update(snapshot)
+                await self.bot.storage.set_document("lockdowns", guild.id, merged)
+            return len(snapshot), len(failed), time.perf_counter() - started
+
+    def log_action(self, ctx, action: str, target: Union[discord.Member, str], reason: str, targets=None):
+        # Queued for batched delivery; commands never wait on the log channel. ``targets`` lists
+        # (id, name) pairs when one embed summarizes an action on many users; each gets an audit entry.
+        embed = discord.Embed(title="🛡️ Moderation Log", color=discord.Color.orange(), timestamp=discord.utils.utcnow())
+        embed.add_field(name="Action", value=action, inline=False)
+        embed.add_field(name="Target", value=str(target), inline=False)
+        embed.add_field(name="Moderator", value=ctx.author.mention, inline=False)
+        embed.add_field(name="Reason", value=reason, inline=False)
+        embed.set_footer(text=f"Channel: #{ctx.channel.name} • ID: {ctx.channel.id}")
+        self.modlog.enqueue(ctx.guild, embed)
+        if targets is None:
+            targets = [(getattr(target, "id", None), str(target))]
+        self.audit.record(ctx.guild.id, action, targets, ctx.author.id, reason)
+
+    @commands.command()
+    @commands.has_permissions(ban_members=True)
+    async def ban(self, ctx, member: Member, *, reason="No reason provided"):
+        await member.ban(reason=reason)
+        await ctx.send(f"🔨 Banned {member} | Reason: {reason}")
+        self.log_action(ctx, "Ban", member, reason)
+
+    @commands.command(help="Unban by ID, mention, username or prefix* (separate several with spaces)")
+    @commands.has_permissions(ban_members=True)
+    async def unban(self, ctx, *, query: str):
+        index = await self.get_ban_index(ctx.guild)
+        matches = index.find(query)
+        if not matches:
+            matches = {u.id: u for part in query.split() for u in index.find(part)}
+            matches = list(matches.values())
+        if not matches:
+            return await ctx.send("❌ User not found.")
+        if len(matches) > MAX_BULK_UNBAN:
+            return await ctx.send(f"❌ That matches {len(matches)} bans; narrow it down to at most {MAX_BULK_UNBAN}.")
+        lane = asyncio.Semaphore(5)
+
+        async def unban_one(user):
+            async with lane:
+                try:
+                    await ctx.guild.unban(user, reason=f"Unbanned by {ctx.author}")
+                    index.remove(user.id)
+                    return True
+                except discord.HTTPException:
+                    return False
+
+        results = await asyncio.gather(*(unban_one(u) for u in matches))
+        unbanned = [u for u, ok in zip(matches, results) if ok]
+        if len(matches) == 1:
+            if not unbanned:
+                return await ctx.send(f"❌ Could not unban {matches[0]}.")
+            await ctx.send(f"✅ Unbanned {unbanned[0]}")
+            self.log_action(ctx, "Unban", unbanned[0], "Manual unban")
+            return
+        failed = len(matches) - len(unbanned)
+        await ctx.send(f"✅ Unbanned {len(unbanned)} users." + (f" {failed} failed." if failed else ""))
+        self.log_action(ctx, "Bulk Unban", f"{len(unbanned)} users", f"Query: {query}", [(u.id, str(u)) for u in unbanned])
+
+    @commands.command()
+    @commands.has_permissions(kick_members=True)
+    async def kick(self, ctx, member: Member, *, reason="No reason provided"):
+        await member.kick(reason=reason)
+        await ctx.send(f"👢 Kicked {member} | Reason: {reason}")
+        self.log_action(ctx, "Kick", member, reason)
+
+    @commands.command()
+    @commands.has_permissions(manage_roles=True)
+    async def mute(self, ctx, member: Member, *, reason="No reason provided"):
+        role = discord.utils.get(ctx.guild.roles, name="Muted")
+        if not role:
+            return await ctx.send("❌ No 'Muted' role found.")
+        await member.add_roles(role)
+        await ctx.send(f"🔇 Muted {member} | Reason: {reason}")
+        self.log_action(ctx, "Mute", member, reason)
+
+    @commands.command()
+    @commands.has_permissions(manage_roles=True)
+    async def unmute(self, ctx, member: Member):
+        role = discord.utils.get(ctx.guild.roles, name="Muted")
+        if role and role in member.roles:
+            await member.remove_roles(role)
+            await ctx.send(f"🔊 Unmuted {member}")
+            self.log_action(ctx, "Unmute", member, "Manual unmute")
+        else:
+            await ctx.send("❌ User is not muted.")
+
+    @commands.command(aliases=['purge'], help="Scan the last <amount> messages and delete those matching the filters: --user, --regex, --bots yes, --attachments yes, --before <id>, --after <id>")
+    @commands.has_permissions(manage_messages=True)
+    async def clear(self, ctx, amount: int = 5, *, flags: PurgeFlags):
+        if amount < 1:
+            return await ctx.send("❌ Please specify at least 1 message to delete.")
+        try:
+            pattern = re.compile(flags.regex, re.IGNORECASE) if flags.regex else None
+        except re.error as e:
+            return await ctx.send(f"❌ Invalid regex: {e}")
+
+        def check(message):
+            if flags.user and message.author.id != flags.user.id:
+                return False
+            if flags.bots and not message.author.bot:
+                return False
+            if flags.attachments and not message.attachments:
+                return False
+            if pattern and not pattern.search(message.content):
+                return False
+            return True
+
+        status = None
+        if amount >= PURGE_PROGRESS_THRESHOLD:
+            status = await ctx.send(f"🧹 Purging up to {amount} messages...")
+
+        async def report(stats):
+            await status.edit(content=f"🧹 Scanned {stats.scanned}/{amount} • deleted {stats.deleted} • old {stats.old} • failed {stats.failed}")
+
+        before = discord.Object(id=flags.before) if flags.before else ctx.message
+        after = discord.Object(id=flags.after) if flags.after else None
+        stats = await purge(ctx.channel, amount, check, before=before, after=after, on_progress=report if status else None)
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
+        summary = f"🧹 Cleared {stats.deleted} messages."
+        if stats.failed:
+            summary += f" ({stats.failed} could not be deleted)"
+        if status:
+            await status.edit(content=summary, delete_after=5)
+        else:
+            await ctx.send(summary, delete_after=2)
+        self.log_action(ctx, "Clear Messages", f"{stats.deleted} messages", f"by {ctx.author}")
+
+    @commands.command()
+    @commands.has_permissions(manage_channels=True)
+    async def slowmode(self, ctx, seconds: int = 0):
+        await ctx.channel.edit(slowmode_delay=seconds)
+        await ctx.send(f"⏱️ Slowmode set to {seconds} seconds.")
+        self.log_action(ctx, "Slowmode Set", ctx.channel.name, f"{seconds} seconds")
+
+    @commands.command()
+    @commands.has_permissions(manage_channels=True)
+    async def lock(self, ctx):
+        await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=False)
+        await ctx.send("🔒 Channel locked.")
+        self.log_action(ctx, "Lock Channel", ctx.channel.name, "Locked by mod")
+
+    @commands.command()
+    @commands.has_permissions(manage_channels=True)
+    async def unlock(self, ctx):
+        await ctx.channel.set_permissions(ctx.guild.default_role, send_messages=True)
+        await ctx.send("🔓 Channel unlocked.")
+        self.log_action(ctx, "Unlock Channel", ctx.channel.name, "Unlocked by mod")
+
+    @commands.command(help="Lock every text channel for @everyone at once; ,unlockall restores the previous permissions")
+    @commands.has_permissions(manage_channels=True)
+    async def lockall(self, ctx, *, reason="Manual lockdown"):
+        status = await ctx.send("🔒 Locking down the server...")
+        locked, failed, elapsed = await self.lock_guild(ctx.guild, f"{ctx.author}: {reason}")
+        await status.edit(content=f"🔒 Locked {locked} channels in {elapsed:.1f}s." + (f" {failed} failed." if failed else ""))
+        self.log_action(ctx, "Lockdown", f"{locked} channels", reason)
+
+    @commands.command(help="Lift a lockdown, restoring each channel's permissions from before it")
+    @commands.has_permissions(manage_channels=True)
+    async def unlockall(self, ctx):
+        async with self.lockdown_locks.setdefault(ctx.guild.id, asyncio.Lock()):
+            snapshot = self.lockdowns.get(ctx.guild.id)
+            if not snapshot:
+                return await ctx.send("❌ The server isn't locked down.")
+            started = time.perf_counter()
+            failed = await restore_channels(ctx.guild, ctx.guild.default_role, snapshot, f"{ctx.author}: lockdown lifted")
+            elapsed = time.perf_counter() - started
+            if failed:
+                # Kept so another ,unlockall can retry them.
+                self.lockdowns[ctx.guild.id] = {c: snapshot[c] for c in failed}
+                await self.bot.storage.set_document("lockdowns", ctx.guild.id, self.lockdowns[ctx.guild.id])
+            else:
+                del self.lockdowns[ctx.guild.id]
+                await self.bot.storage.delete_document("lockdowns", ctx.guild.id)
+        restored = len(snapshot) - len(failed)
+        await ctx.send(f"🔓 Restored {restored} channels in {elapsed:.1f}s." + (f" {len(failed)} failed; run it again to retry." if failed else ""))
+        self.log_action(ctx, "Lift Lockdown", f"{restored} channels", "Lockdown lifted")
+
+    @commands.command(help="Lock the server when <joins> members join within <seconds>; ,antiraid off disables it")
+    @commands.has_permissions(administrator=True)
+    async def antiraid(self, ctx, joins: str = None, seconds: int = 10):
+        if joins is None:
+            settings = self.raid_settings.get(ctx.guild.id)
+            if settings is None:
+                return await ctx.send("🛡️ Anti-raid is off. Enable it with `,antiraid <joins> <seconds>`.")
+            return await ctx.send(f"🛡️ Anti-raid locks the server at {settings['joins']} joins within {settings['seconds']} seconds.")
+        self.join_windows.pop(ctx.guild.id, None)
+        if joins.lower() == "off":
+            self.raid_settings.pop(ctx.guild.id, None)
+            await self.bot.storage.delete_document("antiraid_settings", ctx.guild.id)
+            return await ctx.send("🛡️ Anti-raid disabled.")
+        if not joins.isdigit() or int(joins) < 2 or not 1 <= seconds <= MAX_RAID_WINDOW:
+            return await ctx.send(f"❌ Use at least 2 joins and a window of 1-{MAX_RAID_WINDOW} seconds.")
+        settings = self.raid_settings[ctx.guild.id] = {"joins": int(joins), "seconds": seconds}
+        await self.bot.storage.set_document("antiraid_settings", ctx.guild.id, settings)
+        await ctx.send(f"🛡️ Anti-raid will lock the server at {settings['joins']} joins within {seconds} seconds.")
+        self.log_action(ctx, "Anti-raid", f"{settings['joins']} joins / {seconds}s", "Threshold updated")
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def say(self, ctx, *, message):
+        await ctx.message.delete()
+        await ctx.send(message)
+        self.log_action(ctx, "Say Command", "Bot said a message", message)
+
+    @commands.command()
+    @commands.has_permissions(manage_messages=True)
+    async def warn(self, ctx, member: Member, *, reason="No reason provided"):
+        await self.bot.storage.add_warning(ctx.guild.id, member.id, reason, ctx.author.id)
+        try:
+            await member.send(f"⚠️ You have been warned in **{ctx.guild.name}**.\n**Reason:** {reason}")
+        except discord.Forbidden:
+            await ctx.send("❌ Couldn't DM the user.")
+        await ctx.send(f"⚠️ Warned {member.mention} | Reason: {reason}")
+        self.log_action(ctx, "Warn", member, reason)
+
+    @commands.command()
+    @commands.has_permissions(manage_messages=True)
+    async def warnings(self, ctx, member: Member):
+        user_warnings = await self.bot.storage.get_warnings(ctx.guild.id, member.id)
+        if not user_warnings:
+            return await ctx.send(f"✅ {member.display_name} has no warnings.")
+        lines = []
+        for i, warning in enumerate(user_warnings, 1):
+            line = f"{i}. {warning['reason']}"
+            if warning["moderator_id"] is not None:
+                line += f" — <@{warning['moderator_id']}> <t:{int(warning['created_at'])}:R>"
+            lines.append(line)
+        warning_list = "\n".join(lines)
+        embed = discord.Embed(title=f"⚠️ Warnings for {member.display_name}", description=warning_list, color=discord.Color.orange())
+        await ctx.send(embed=embed)
+
+    @commands.command(aliases=["delwarn", "clearwarn"])
+    @commands.has_permissions(manage_messages=True)
+    async def removewarn(self, ctx, member: Member, index: int = None):
+        removed = None
+        if index is not None:
+            removed = await self.bot.storage.remove_warning(ctx.guild.id, member.id, index)
+        if removed is None:
+            user_warnings = await self.bot.storage.get_warnings(ctx.guild.id, member.id)
+            if not user_warnings:
+                return await ctx.send("❌ That user has no warnings.")
+            return await ctx.send(f"❌ Provide a valid warning number between 1 and {len(user_warnings)}.")
+        await ctx.send(f"✅ Removed warning #{index} from {member.mention}.\n**Removed Reason:** {removed}")
+        self.log_action(ctx, "Remove Warn", member, f"Removed warning #{index}: {removed}")
+
+    @commands.command()
+    @commands.has_permissions(moderate_members=True)
+    async def timeout(self, ctx, member: Member, duration: int, *, reason="No reason provided"):
+        try:
+            until = discord.utils.utcnow() + timedelta(minutes=duration)
+            await member.timeout(until, reason=reason)
+            await ctx.send(f"⏲️ {member.mention} has been timed out for {duration} minutes.\nReason: {reason}")
+        except Exception as e:
+            return await ctx.send(f"❌ Could not timeout the member: {e}")
+        self.log_action(ctx, f"Timeout ({duration}m)", member, reason)
+
+    @commands.command()
+    @commands.has_permissions(moderate_members=True)
+    async def untimeout(self, ctx, member: Member, *, reason="No reason provided"):
+        try:
+            await member.timeout(None, reason=reason)
+            await ctx.send(f"✅ {member.mention} has been un-timed out.\nReason: {reason}")
+        except Exception as e:
+            return await ctx.send(f"❌ Could not remove timeout: {e}")
+        self.log_action(ctx, "Remove Timeout", member, reason)
+
+    async def resolve_mass_targets(self, ctx, targets, flags):
+        """Explicit targets plus members matching every given filter, minus anyone the author can't act on.
+
+        Explicit IDs are looked up as members first, so the role check covers
+        them too; only users who aren't in the guild (ban-only) skip it.
+        """
+        found = {}
+        lane = asyncio.Semaphore(5)
+
+        async def resolve(target):
+            if isinstance(target, discord.Member):
+                found[target.id] = target
+                return
+            async with lane:
+                try:
+                    member = await self.bot.members.get(ctx.guild, target.id)
+                except discord.HTTPException:
+                    return  # can't tell whether they outrank the author, so leave them out
+            found[target.id] = member or target
+
+        await asyncio.gather(*(resolve(t) for t in targets))
+        if flags.joined is not None or flags.regex:
+            pattern = re.compile(flags.regex, re.IGNORECASE) if flags.regex else None
+            since = discord.utils.utcnow() - timedelta(minutes=flags.joined or 0)
+            if ctx.guild.chunked:
+                members = ctx.guild.members
+            else:
+                members = [m async for m in ctx.guild.fetch_members(limit=None)]
+            for member in members:
+                if flags.joined is not None and (member.joined_at is None or member.joined_at < since):
+                    continue
+                if pattern and not (pattern.search(member.name) or pattern.search(member.display_name)):
+                    continue
+                found[member.id] = member
+        protected = {ctx.author.id, ctx.guild.owner_id, self.bot.user.id}
+        return [
+            t for t in found.values()
+            if t.id not in protected
+            and not (isinstance(t, discord.Member) and t.top_role >= ctx.author.top_role and ctx.author.id != ctx.guild.owner_id)
+        ]
+
+    async def mass_action(self, ctx, verb, action, targets, flags, run):
+        if len(targets) > MAX_MASS_ACTION:
+            return await ctx.send(f"❌ That's {len(targets)} users; give at most {MAX_MASS_ACTION}.")
+        try:
+            targets = await self.resolve_mass_targets(ctx, targets, flags)
+        except re.error as e:
+            return await ctx.send(f"❌ Invalid regex: {e}")
+        if not targets:
+            return await ctx.send("❌ No targets. Give IDs or mentions, or filter with --joined <minutes> / --regex <pattern>.")
+        if len(targets) > MAX_MASS_ACTION:
+            return await ctx.send(f"❌ That matches {len(targets)} users; narrow it down to at most {MAX_MASS_ACTION}.")
+        status = await ctx.send(f"⏳ {verb} {len(targets)} users...")
+
+        async def report(stats):
+            await status.edit(content=f"⏳ {verb} {stats.processed}/{stats.total} • done {len(stats.done)} • failed {len(stats.failed)}")
+
+        stats = await run(targets, report)
+        summary = f"✅ {action}: {len(stats.done)}/{stats.total} users."
+        if stats.failed:
+            summary += f" {len(stats.failed)} failed."
+        await status.edit(content=summary)
+        criteria = ", ".join(
+            f"{name} {value}" for name, value in (("joined within (min)", flags.joined), ("name matching", flags.regex)) if value
+        )
+        names = {t.id: str(t.id) if isinstance(t, discord.Object) else str(t) for t in targets}
+        self.log_action(ctx, action, f"{len(stats.done)} users" + (f" ({len(stats.failed)} failed)" if stats.failed else ""),
+                        flags.reason + (f" • {criteria}" if criteria else ""), [(i, names[i]) for i in stats.done])
+
+    @commands.command(help="Ban many users at once: IDs/mentions and/or --joined <minutes> --regex <name pattern>, plus --reason")
+    @commands.has_permissions(ban_members=True)
+    async def massban(self, ctx, targets: commands.Greedy[discord.Object], *, flags: MassFlags):
+        async def run(users, report):
+            return await bulk_ban(ctx.guild, users, reason=f"{ctx.author}: {flags.reason}", on_progress=report)
+
+        await self.mass_action(ctx, "Banning", "Mass Ban", targets, flags, run)
+
+    @commands.command(help="Kick many members at once: IDs/mentions and/or --joined <minutes> --regex <name pattern>, plus --reason")
+    @commands.has_permissions(kick_members=True)
+    async def masskick(self, ctx, targets: commands.Greedy[discord.Object], *, flags: MassFlags):
+        async def kick_one(target):
+            # Targets still left as bare Objects aren't in the guild (see resolve_mass_targets).
+            if not isinstance(target, discord.Member):
+                return False
+            await target.kick(reason=f"{ctx.author}: {flags.reason}")
+
+        async def run(members, report):
+            return await run_bulk(members, kick_one, on_progress=report)
+
+        await self.mass_action(ctx, "Kicking", "Mass Kick", targets, flags, run)
+
+    @commands.command(help="Time out many members for <minutes>: IDs/mentions and/or --joined <minutes> --regex <name pattern>, plus --reason")
+    @commands.has_permissions(moderate_members=True)
+    async def masstimeout(self, ctx, duration: int, targets: commands.Greedy[discord.Object], *, flags: MassFlags):
+        if not 1 <= duration <= MAX_TIMEOUT_MINUTES:
+            return await ctx.send(f"❌ Timeouts must last between 1 and {MAX_TIMEOUT_MINUTES} minutes (28 days).")
+        until = discord.utils.utcnow() + timedelta(minutes=duration)
+
+        async def timeout_one(target):
+            if not isinstance(target, discord.Member):
+                return False
+            await target.timeout(until, reason=f"{ctx.author}: {flags.reason}")
+
+        async def run(members, report):
+            return await run_bulk(members, timeout_one, on_progress=report)
+
+        await self.mass_action(ctx, "Timing out", f"Mass Timeout ({duration}m)", targets, flags, run)
+
+    @commands.command(help="Ban a member and record their IP address or CIDR range (e.g. 203.0.113.0/24)")
+    @commands.has_permissions(ban_members=True)
+    async def ipban(self, ctx, member: Member, ip: str, *, reason="No reason provided"):
+        try:
+            network = IPBanIndex.parse(ip)
+        except ValueError:
+            return await ctx.send("❌ That isn't a valid IP address or CIDR range.")
+        index = await self.get_ip_index()
+        existing = index.get(network)
+        key = existing[0] if existing else IPBanIndex.key(network)
+        overlapping = index.overlapping(network)
+        await self.bot.storage.add_ip_ban(key, member.id, reason, ctx.author.id)
+        index.add(network, (key, member.id, reason, ctx.author.id))
+        await member.ban(reason=f"IP Ban: {reason}")
+        message = f"🚫 IP `{key}` associated with {member} has been banned.\nReason: {reason}"
+        broader = [n for n, _ in overlapping if n.prefixlen < network.prefixlen]
+        narrower = [n for n, _ in overlapping if n.prefixlen > network.prefixlen]
+        if broader:
+            message += f"\nℹ️ Already covered by `{IPBanIndex.key(broader[0])}`."
+        if narrower:
+            message += f"\nℹ️ Covers {len(narrower)} narrower ban(s)."
+        await ctx.send(message)
+        self.log_action(ctx, "IP Ban", f"{member} (IP: {key})", reason, [(member.id, f"{member} (IP: {key})")])
+
+    @commands.command(help="Remove an IP address or CIDR range ban")
+    @commands.has_permissions(ban_members=True)
+    async def unipban(self, ctx, ip: str):
+        index = await self.get_ip_index()
+        try:
+            network = IPBanIndex.parse(ip)
+        except ValueError:
+            # Only bans stored before addresses were validated can fail to parse.
+            network = None
+        existing = index.get(network) if network is not None else None
+        removed = await self.bot.storage.remove_ip_ban(existing[0] if existing else ip)
+        if network is not None:
+            index.remove(network)
+        if removed is not None:
+            await ctx.send(f"✅ IP `{ip}` unbanned. Previously linked to user ID {removed['user_id']}.")
+            self.log_action(ctx, "Un-IP Ban", ip, "Manual unban")
+        elif network is not None and index.covering(network):
+            await ctx.send(f"❌ `{ip}` isn't banned by itself; it's inside `{IPBanIndex.key(index.covering(network)[0][0])}`.")
+        else:
+            await ctx.send("❌ That IP isn’t currently banned.")
+
+    @commands.command(help="Check whether an IP address or range is covered by, or overlaps, any IP ban")
+    @commands.has_permissions(ban_members=True)
+    async def ipcheck(self, ctx, ip: str):
+        try:
+            network = IPBanIndex.parse(ip)
+        except ValueError:
+            return await ctx.send("❌ That isn't a valid IP address or CIDR range.")
+        index = await self.get_ip_index()
+        overlapping = index.overlapping(network)
+        if not overlapping:
+            return await ctx.send(f"✅ `{ip}` is not covered by any IP ban.")
+        lines = [f"`{IPBanIndex.key(n)}` - User ID: {ban[1]} (Reason: {ban[2][:100]})" for n, ban in overlapping[:IP_BANS_PAGE_SIZE]]
+        if len(overlapping) > IP_BANS_PAGE_SIZE:
+            lines.append(f"…and {len(overlapping) - IP_BANS_PAGE_SIZE} more")
+        embed = discord.Embed(title=f"🔎 IP bans overlapping {ip}", description="\n".join(lines), color=discord.Color.red())
+        await ctx.send(embed=embed)
+
+    @commands.command(help="List IP bans in address order, a page at a time")
+    @commands.has_permissions(ban_members=True)
+    async def ipbans(self, ctx, page: int = 1):
+        index = await self.get_ip_index()
+        if not len(index):
+            return await ctx.send("✅ No IPs are currently banned.")
+        pages = (len(index) + IP_BANS_PAGE_SIZE - 1) // IP_BANS_PAGE_SIZE
+        page = max(1, min(page, pages))
+        ban_list = "\n".join(
+            f"`{IPBanIndex.key(network)}` - User ID: {ban[1]} (Reason: {ban[2][:100]})"
+            for network, ban in index.page((page - 1) * IP_BANS_PAGE_SIZE, IP_BANS_PAGE_SIZE)
+        )
+        embed = discord.Embed(title="🚫 IP Ban List", description=ban_list, color=discord.Color.red())
+        embed.set_footer(text=f"Page {page}/{pages} • {len(index)} bans")
+        await ctx.send(embed=embed)
+
+    @commands.command(help="List the banned address space with nested and adjacent IP bans merged")
+    @commands.has_permissions(ban_members=True)
+    async def ipranges(self, ctx, page: int = 1):
+        index = await self.get_ip_index()
+        spans = index.merged()
+        if not spans:
+            return await ctx.send("✅ No IPs are currently banned.")
+        pages = (len(spans) + IP_BANS_PAGE_SIZE - 1) // IP_BANS_PAGE_SIZE
+        page = max(1, min(page, pages))
+        start = (page - 1) * IP_BANS_PAGE_SIZE
+        lines = [f"`{IPBanIndex.describe(*span)}`" for span in spans[start:start + IP_BANS_PAGE_SIZE]]
+        embed = discord.Embed(title="🚫 Banned IP Ranges", description="\n".join(lines), color=discord.Color.red())
+        embed.set_footer(text=f"Page {page}/{pages} • {len(spans)} ranges from {len(index)} bans")
+        await ctx.send(embed=embed)
+
+    @commands.command(help="Show the moderation actions taken against a user, newest first")
+    @commands.has_permissions(manage_messages=True)
+    async def history(self, ctx, user: discord.User, page: int = 1):
+        await self.audit.flush()
+        total = await self.bot.storage.count_audit(ctx.guild.id, user.id)
+        if not total:
+            return await ctx.send(f"✅ No moderation history for {user}.")
+        pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        page = max(1, min(page, pages))
+        entries = await self.bot.storage.get_audit(ctx.guild.id, user.id, HISTORY_PAGE_SIZE, (page - 1) * HISTORY_PAGE_SIZE)
+        lines = [
+            f"`#{e['id']}` <t:{int(e['created_at'])}:d> **{e['action']}** by <@{e['moderator_id']}> — {e['reason']}"
+            for e in entries
+        ]
+        embed = discord.Embed(title=f"📜 History for {user}", description="\n".join(lines)[:4096], color=discord.Color.orange())
+        embed.set_footer(text=f"Page {page}/{pages} • {total} entries")
+        await ctx.send(embed=embed)
+
+    @commands.command(help="Count moderation actions per moderator, over all time or the last [days] days")
+    @commands.has_permissions(manage_messages=True)
+    async def modstats(self, ctx, days: int = None):
+        await self.audit.flush()
+        since = time.time() - days * 86400 if days else None
+        stats = await self.bot.storage.audit_stats(ctx.guild.id, since)
+        if not stats:
+            return await ctx.send("✅ No moderation actions recorded" + (f" in the last {days} days." if days else "."))
+        ranked = sorted(stats.items(), key=lambda item: sum(item[1].values()), reverse=True)[:10]
+        lines = []
+        for moderator_id, actions in ranked:
+            breakdown = ", ".join(f"{action} {count}" for action, count in sorted(actions.items(), key=lambda a: -a[1]))
+            lines.append(f"<@{moderator_id}> — **{sum(actions.values())}** ({breakdown})")
+        title = f"📊 Moderation Stats ({f'last {days} days' if days else 'all time'})"
+        await ctx.send(embed=discord.Embed(title=title, description="\n".join(lines)[:4096], color=discord.Color.blurple()))
+
+    @commands.command(help="Export the moderation audit log as gzipped jsonl or csv, optionally only the last [days] days")
+    @commands.has_permissions(administrator=True)
+    async def exportlog(self, ctx, fmt: str = "jsonl", days: int = None):
+        fmt = fmt.lower()
+        if fmt not in ("jsonl", "csv"):
+            return await ctx.send("❌ Format must be `jsonl` or `csv`.")
+        await self.audit.flush()
+        since = time.time() - days * 86400 if days else None
+        fd, path = tempfile.mkstemp(suffix=f".{fmt}.gz")
+        os.close(fd)
+        try:
+            count = await audit.export(self.bot.storage, ctx.guild.id, path, fmt, since)
+            if not count:
+                return await ctx.send("✅ No moderation actions recorded" + (f" in the last {days} days." if days else "."))
+            if os.path.getsize(path) > ctx.guild.filesize_limit:
+                return await ctx.send(f"❌ The export of {count} entries is too large to upload; narrow it down with [days].")
+            await ctx.send(
+                f"📦 Exported {count} audit entries.",
+                file=discord.File(path, filename=f"modlog-{ctx.guild.id}.{fmt}.gz"),
+            )
+        finally:
+            os.remove(path)
+
+async def setup(bot):
+    await bot.add_cog(Moderation(bot))
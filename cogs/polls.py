@@ -0,0 +1,130 @@
+import discord
+from discord.ext import commands
+import asyncio
+import time
+from polls import Poll, parse_duration, NUMBER_EMOJIS, YES_NO_EMOJIS
+
+POLL_EDIT_INTERVAL = 3  # seconds between result edits of one poll, however fast votes arrive
+POLL_DEFAULT_DURATION = 86400
+POLL_MIN_DURATION = 60
+POLL_MAX_DURATION = 30 * 86400
+
+class Polls(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.polls = {}  # message_id -> Poll
+        self.updates = {}  # message_id -> pending debounced edit
+        self.closers = {}  # message_id -> task that ends the poll
+
+    async def cog_load(self):
+        for data in (await self.bot.storage.get_documents("polls")).values():
+            poll = Poll.from_document(data)
+            self.polls[poll.message_id] = poll
+            self.closers[poll.message_id] = asyncio.create_task(self.close_later(poll))
+
+    async def cog_unload(self):
+        for task in self.closers.values():
+            task.cancel()
+        for message_id, task in list(self.updates.items()):
+            task.cancel()
+            await self.save(self.polls[message_id])
+
+    async def save(self, poll):
+        await self.bot.storage.set_document("polls", poll.message_id, poll.to_document())
+
+    def embed(self, poll):
+        return discord.Embed(title=f"📊 {poll.question}", description=poll.render(), color=discord.Color.blurple())
+
+    def schedule_update(self, poll):
+        # One edit per POLL_EDIT_INTERVAL per poll; later votes ride along with it.
+        if poll.message_id not in self.updates:
+            self.updates[poll.message_id] = asyncio.create_task(self.update_later(poll))
+
+    async def update_later(self, poll):
+        try:
+            await asyncio.sleep(POLL_EDIT_INTERVAL)
+        finally:
+            self.updates.pop(poll.message_id, None)
+        await self.refresh(poll)
+        if poll.message_id in self.polls:
+            await self.save(poll)
+
+    async def refresh(self, poll):
+        channel = self.bot.get_channel(poll.channel_id)
+        if channel is None:
+            return
+        try:
+            await channel.get_partial_message(poll.message_id).edit(embed=self.embed(poll))
+        except discord.NotFound:
+            await self.discard(poll)
+        except discord.HTTPException as e:
+            print(f"[polls] Failed to update poll {poll.message_id}: {e}")
+
+    async def discard(self, poll):
+        self.polls.pop(poll.message_id, None)
+        for tasks in (self.updates, self.closers):
+            task = tasks.pop(poll.message_id, None)
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        await self.bot.storage.delete_document("polls", poll.message_id)
+
+    async def close_later(self, poll):
+        # Polls that ended while the bot was offline close here too; channels only resolve once ready.
+        await self.bot.wait_until_ready()
+        await asyncio.sleep(max(0, poll.ends_at - time.time()))
+        await self.discard(poll)
+        await self.refresh(poll)
+        channel = self.bot.get_channel(poll.channel_id)
+        if channel is not None and sum(poll.counts):
+            best = max(poll.counts)
+            winners = ", ".join(f"**{o}**" for o, c in zip(poll.options, poll.counts) if c == best)
+            self.bot.outbound.send(channel, f"📊 Poll **{poll.question}** has ended. Winner: {winners} ({best} votes)")
+
+    def on_reaction(self, payload, change):
+        # Every reaction in every channel lands here, so unrelated ones cost a single dict miss.
+        poll = self.polls.get(payload.message_id)
+        if poll is None or payload.user_id == self.bot.user.id:
+            return
+        if poll.tally(str(payload.emoji), change):
+            self.schedule_update(poll)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload):
+        self.on_reaction(payload, 1)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        self.on_reaction(payload, -1)
+
+    @commands.command(help="Start a poll: ,poll [30m|2h|1d] question | option 1 | option 2 ... (yes/no without options)")
+    @commands.guild_only()
+    async def poll(self, ctx, *, text):
+        first, _, rest = text.partition(" ")
+        duration = parse_duration(first)
+        if duration is not None and rest:
+            text = rest
+        else:
+            duration = POLL_DEFAULT_DURATION
+        if duration < POLL_MIN_DURATION:
+            return await ctx.send(f"❌ Polls must run for at least {POLL_MIN_DURATION // 60} minute.")
+        if duration > POLL_MAX_DURATION:
+            return await ctx.send(f"❌ Polls can run for at most {POLL_MAX_DURATION // 86400} days.")
+        question, *options = [part.strip() for part in text.split("|")]
+        options = [option for option in options if option]
+        if not options:
+            options, emojis = ["Yes", "No"], YES_NO_EMOJIS
+        elif 2 <= len(options) <= len(NUMBER_EMOJIS):
+            emojis = NUMBER_EMOJIS[:len(options)]
+        else:
+            return await ctx.send(f"❌ A poll needs between 2 and {len(NUMBER_EMOJIS)} options.")
+        poll = Poll(None, ctx.channel.id, ctx.guild.id, question, options, emojis, time.time() + duration)
+        message = await ctx.send(embed=self.embed(poll))
+        poll.message_id = message.id
+        self.polls[message.id] = poll
+        await self.save(poll)
+        self.closers[message.id] = asyncio.create_task(self.close_later(poll))
+        for emoji in emojis:
+            await message.add_reaction(emoji)
+
+async def setup(bot):
+    await bot.add_cog(Polls(bot))
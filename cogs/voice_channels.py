@@ -0,0 +1,28 @@
+from discord.ext import commands
+
+class VoiceChannels(commands.Cog):
+    required_intents = ("voice_states",)
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # Placeholder: add your voice channel related commands here
+    @commands.command()
+    async def join(self, ctx):
+        if ctx.author.voice:
+            channel = ctx.author.voice.channel
+            await channel.connect()
+            await ctx.send(f"Joined {channel.name}!")
+        else:
+            await ctx.send("You must be in a voice channel first!")
+
+    @commands.command()
+    async def leave(self, ctx):
+        if ctx.voice_client:
+            await ctx.voice_client.disconnect()
+            await ctx.send("Left the voice channel.")
+        else:
+            await ctx.send("I'm not in a voice channel!")
+
+async def setup(bot):
+    await bot.add_cog(VoiceChannels(bot))
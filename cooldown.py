@@ -0,0 +1,41 @@
+import time
+
+
+class CooldownTable:
+    """Per-key cooldowns that only remember keys still cooling down.
+
+    Stores one float expiry per key. Expired entries carry no information, so
+    a sweep every ``sweep_interval`` seconds drops them: memory tracks the
+    users active within the last ``window`` seconds, not everyone ever seen.
+    """
+
+    __slots__ = ("window", "sweep_interval", "_expires", "_next_sweep")
+
+    def __init__(self, window, sweep_interval=60.0):
+        self.window = window
+        self.sweep_interval = sweep_interval
+        self._expires = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def __len__(self):
+        return len(self._expires)
+
+    def try_acquire(self, key, now=None):
+        """Start ``key``'s cooldown and return True, or return False if it is still cooling down."""
+        if self.window <= 0:
+            return True
+        if now is None:
+            now = time.monotonic()
+        expires = self._expires.get(key)
+        if expires is not None and expires > now:
+            return False
+        self._expires[key] = now + self.window
+        if now >= self._next_sweep:
+            self.sweep(now)
+        return True
+
+    def sweep(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        self._expires = {key: expires for key, expires in self._expires.items() if expires > now}
+        self._next_sweep = now + self.sweep_interval
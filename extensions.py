@@ -0,0 +1,61 @@
+import importlib
+import inspect
+import time
+
+from discord.ext import commands
+
+PACKAGE = "cogs"
+# activity_watcher is left out: it needs the privileged presences intent, which is most of a
+# bot's gateway traffic. Add it to EXTENSIONS only on deployments that track activity.
+DEFAULT_EXTENSIONS = [
+    "moderation", "fun", "custom_vc", "leveling", "polls", "voice_channels", "automod", "admin",
+]
+
+
+def qualified(name):
+    return name if name.startswith(PACKAGE + ".") else f"{PACKAGE}.{name}"
+
+
+def cog_classes(module):
+    return [
+        obj for obj in vars(module).values()
+        if inspect.isclass(obj) and issubclass(obj, commands.Cog) and obj.__module__ == module.__name__
+    ]
+
+
+def import_extensions(names, timings):
+    """Import each extension module and return the cog classes it defines.
+
+    Import time (including anything the module pulls in for the first time)
+    is recorded in ``timings[name]["import"]``. The classes are only used to
+    derive gateway intents before the bot exists; ``load_extensions`` runs
+    the real setup.
+    """
+    classes = []
+    for name in names:
+        started = time.perf_counter()
+        module = importlib.import_module(qualified(name))
+        timings.setdefault(name, {})["import"] = time.perf_counter() - started
+        classes.extend(cog_classes(module))
+    return classes
+
+
+async def load_extensions(bot, names, timings):
+    for name in names:
+        started = time.perf_counter()
+        try:
+            await bot.load_extension(qualified(name))
+        except commands.ExtensionError as e:
+            print(f"[extensions] Failed to load {name}: {e}")
+            continue
+        timings.setdefault(name, {})["setup"] = time.perf_counter() - started
+
+
+# Reload hand-off: a cog's cog_unload stashes the in-memory state worth keeping
+# and its replacement picks it up in cog_load instead of rebuilding it.
+def stash(bot, cog, **state):
+    bot.carryover[type(cog).__name__] = state
+
+
+def unstash(bot, cog):
+    return bot.carryover.pop(type(cog).__name__, None)
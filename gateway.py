@@ -0,0 +1,75 @@
+import discord
+
+# Gateway intents each listener needs in order to receive its event at all.
+LISTENER_INTENTS = {
+    "on_message": ("messages", "message_content"),
+    "on_message_delete": ("messages",),
+    "on_message_edit": ("messages", "message_content"),
+    "on_raw_message_delete": ("messages",),
+    "on_member_join": ("members",),
+    "on_member_remove": ("members",),
+    "on_member_update": ("members",),
+    "on_raw_member_remove": ("members",),
+    "on_member_ban": ("moderation",),
+    "on_member_unban": ("moderation",),
+    "on_presence_update": ("presences",),
+    "on_raw_presence_update": ("presences",),
+    "on_voice_state_update": ("voice_states",),
+    "on_reaction_add": ("reactions",),
+    "on_reaction_remove": ("reactions",),
+    "on_raw_reaction_add": ("reactions",),
+    "on_raw_reaction_remove": ("reactions",),
+    "on_guild_channel_create": ("guilds",),
+    "on_guild_channel_delete": ("guilds",),
+    "on_guild_channel_update": ("guilds",),
+}
+
+
+def derive_intents(cogs):
+    """Smallest intent set covering prefix commands plus the given cog classes.
+
+    Listener intents come from ``LISTENER_INTENTS``; a cog whose commands need
+    more (e.g. voice state for ``join``) lists them in ``required_intents``.
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.messages = True
+    intents.message_content = True
+    for cog in cogs:
+        flags = list(getattr(cog, "required_intents", ()))
+        for event, _ in cog.__cog_listeners__:
+            flags.extend(LISTENER_INTENTS.get(event, ()))
+        for flag in flags:
+            setattr(intents, flag, True)
+    return intents
+
+
+def full_intents():
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.guilds = True
+    intents.members = True
+    intents.presences = True
+    return intents
+
+
+def bot_options(profile, cogs):
+    """Keyword arguments for ``commands.Bot`` under the ``full`` or ``lean`` profile.
+
+    ``lean`` subscribes only to the events the loaded cogs handle, skips member
+    chunking at startup and caches only members that are in voice channels.
+    """
+    if profile == "full":
+        return {"intents": full_intents(), "enable_raw_presences": True}
+    if profile != "lean":
+        raise ValueError(f"Unknown bot profile: {profile!r}")
+    intents = derive_intents(cogs)
+    member_cache = discord.MemberCacheFlags.none()
+    member_cache.voice = intents.voice_states
+    return {
+        "intents": intents,
+        "chunk_guilds_at_startup": False,
+        "member_cache_flags": member_cache,
+        # Presences for uncached members still arrive as on_raw_presence_update.
+        "enable_raw_presences": intents.presences,
+    }
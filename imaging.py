@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import signal
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+class ConverterBusy(Exception):
+    pass
+
+
+# Workers start from a clean process rather than a fork of the bot, which already runs the
+# storage and watchdog threads and could hand a worker one of their locks mid-use.
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Modes Image.reduce supports; others (e.g. palette GIF frames) are shrunk with a nearest-neighbour resize.
+REDUCIBLE_MODES = ("L", "LA", "RGB", "RGBa", "RGBA", "I", "F")
+
+
+def convert_to_gif(data, max_pixels, max_side, max_frames, max_total_pixels):
+    """Worker-process entry point: encode ``data`` as a (possibly animated) GIF.
+
+    Frames are shrunk in their source mode before being expanded to RGBA, and
+    decoding stops once the kept frames add up to ``max_total_pixels``.
+    """
+    from PIL import Image, ImageSequence
+
+    Image.MAX_IMAGE_PIXELS = None  # the explicit check below replaces Pillow's bomb warning
+    image = Image.open(BytesIO(data))  # only parses the header; nothing is decoded yet
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ImageTooLarge(f"Image is {width}x{height}, limit is {max_pixels:,} pixels.")
+    # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale directly; other formats ignore this.
+    image.draft("RGB", (max_side, max_side))
+    frames = []
+    durations = []
+    total_pixels = 0
+    for frame in ImageSequence.Iterator(image):
+        if len(frames) >= max_frames:
+            break
+        factor = max(frame.size) // max_side
+        if factor > 1:
+            if frame.mode in REDUCIBLE_MODES:
+                frame = frame.reduce(factor)
+            else:
+                frame = frame.resize((max(1, frame.width // factor), max(1, frame.height // factor)), Image.Resampling.NEAREST)
+        frame = frame.convert("RGBA")
+        if max(frame.size) > max_side:
+            frame.thumbnail((max_side, max_side))
+        total_pixels += frame.width * frame.height
+        if frames and total_pixels > max_total_pixels:
+            break
+        frames.append(frame)
+        durations.append(frame.info.get("duration", image.info.get("duration", 100)))
+    out = BytesIO()
+    if len(frames) > 1:
+        frames[0].save(
+            out, format="GIF", save_all=True, append_images=frames[1:],
+            duration=durations, loop=image.info.get("loop", 0), disposal=2,
+        )
+    else:
+        frames[0].save(out, format="GIF")
+    return out.getvalue()
+
+
+def _report_pid(pids):
+    # Pool initializer: tells the parent which processes to kill if a job hangs. A worker that
+    # only starts once its pool is gone finds the pipe closed and simply exits.
+    try:
+        pids.send(os.getpid())
+    except OSError:
+        pass
+
+
+class ImageConverter:
+    """Runs image conversions in a bounded process pool with an LRU result cache.
+
+    At most ``max_queue`` jobs may be queued or running; further requests fail
+    fast with ``ConverterBusy``. Results are cached by the SHA-256 of the input
+    so re-posted images skip the pool entirely.
+    """
+
+    def __init__(self, workers=2, max_queue=8, timeout=20.0, max_bytes=8 * 1024 * 1024,
+                 max_pixels=40_000_000, max_side=1024, max_frames=100, max_total_pixels=32_000_000,
+                 cache_bytes=32 * 1024 * 1024):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_pixels = max_pixels
+        self.max_side = max_side
+        self.max_frames = max_frames
+        self.max_total_pixels = max_total_pixels  # across kept frames: about 128 MB of RGBA per worker
+        self.cache_bytes = cache_bytes
+        self._pool = None
+        self._pids = None  # (reader, writer) of the pipe workers report their PIDs on
+        self._inflight = {}
+        self._cache = OrderedDict()
+        self._cache_size = 0
+
+    @property
+    def queued(self):
+        return len(self._inflight)
+
+    @property
+    def cache_size(self):
+        return len(self._cache)
+
+    def _get_pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context(START_METHOD)
+            self._pids = context.Pipe(duplex=False)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context, initializer=_report_pid, initargs=(self._pids[1],)
+            )
+        return self._pool
+
+    def _reset_pool(self):
+        # A worker stuck on a job can't be interrupted, so kill every worker the pool started
+        # and begin again; jobs sharing the pool fail with BrokenProcessPool.
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            reader, writer = self._pids
+            while reader.poll():
+                try:
+                    os.kill(reader.recv(), signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            self._close_pids()
+            self._pool = None
+
+    def _close_pids(self):
+        for end in self._pids:
+            end.close()
+        self._pids = None
+
+    def _remember(self, key, result):
+        if len(result) > self.cache_bytes:
+            return
+        self._cache[key] = result
+        self._cache_size += len(result)
+        while self._cache_size > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_size -= len(evicted)
+
+    async def to_gif(self, data):
+        if len(data) > self.max_bytes:
+            raise ImageTooLarge(f"File is larger than {self.max_bytes // (1024 * 1024)} MB.")
+        key = hashlib.sha256(data).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        # Identical uploads already in flight share one job.
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        if len(self._inflight) >= self.max_queue:
+            raise ConverterBusy("Too many images are being converted right now. Try again shortly.")
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(
+            self._get_pool(), convert_to_gif, data, self.max_pixels, self.max_side, self.max_frames,
+            self.max_total_pixels,
+        )
+        self._inflight[key] = job
+        try:
+            result = await asyncio.wait_for(asyncio.shield(job), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            job.cancel()
+            self._reset_pool()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self._remember(key, result)
+        return result
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._close_pids()
+            self._pool = None
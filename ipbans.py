@@ -0,0 +1,340 @@
+import ipaddress
+import itertools
+
+
+class _Node:
+    __slots__ = ("prefix", "length", "zero", "one", "value", "count")
+
+    def __init__(self, prefix, length, value=None):
+        self.prefix = prefix  # network address as an int, host bits zero
+        self.length = length
+        self.zero = None
+        self.one = None
+        self.value = value
+        self.count = 0 if value is None else 1  # values stored in this subtree
+
+    def child(self, bit):
+        return self.one if bit else self.zero
+
+    def set_child(self, bit, node):
+        if bit:
+            self.one = node
+        else:
+            self.zero = node
+
+
+class _RadixTrie:
+    """Path-compressed binary trie of prefixes for one address width.
+
+    Nodes exist only where a prefix is stored or two branches split, so it
+    holds at most two nodes per entry, and every walk from the root takes at
+    most ``width`` steps. Each node counts the values below it, so ``walk_from``
+    can start at any position without walking the entries before it.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self.root = _Node(0, 0)
+
+    @property
+    def size(self):
+        return self.root.count
+
+    def _bit(self, prefix, index):
+        return (prefix >> (self.width - 1 - index)) & 1
+
+    def _common(self, a, b, limit):
+        return min(self.width - (a ^ b).bit_length(), limit)
+
+    def _mask(self, prefix, length):
+        shift = self.width - length
+        return prefix >> shift << shift
+
+    def insert(self, prefix, length, value):
+        # The bit tests are inlined: this loop is most of the cost of loading a large ban list.
+        width = self.width
+        node = self.root
+        path = []
+        while node.length < length:
+            path.append(node)
+            bit = (prefix >> (width - 1 - node.length)) & 1
+            child = node.one if bit else node.zero
+            if child is None:
+                node.set_child(bit, _Node(prefix, length, value))
+                for parent in path:
+                    parent.count += 1
+                return
+            common = min(width - (child.prefix ^ prefix).bit_length(), child.length, length)
+            if common == child.length:
+                node = child
+                continue
+            # The new prefix branches off inside ``child``'s compressed edge: split it there.
+            split = _Node(self._mask(prefix, common), common)
+            node.set_child(bit, split)
+            split.set_child(self._bit(child.prefix, common), child)
+            if common == length:
+                split.value = value
+            else:
+                split.set_child(self._bit(prefix, common), _Node(prefix, length, value))
+            split.count = child.count + 1
+            for parent in path:
+                parent.count += 1
+            return
+        if node.value is None:
+            path.append(node)
+            for parent in path:
+                parent.count += 1
+        node.value = value
+
+    def _path(self, prefix, length):
+        """Nodes from the root down to the one holding exactly ``prefix/length``, or None."""
+        path = [self.root]
+        node = self.root
+        while node.length < length:
+            node = node.child(self._bit(prefix, node.length))
+            if node is None or node.length > length or self._common(node.prefix, prefix, node.length) < node.length:
+                return None
+            path.append(node)
+        return path
+
+    def get(self, prefix, length):
+        path = self._path(prefix, length)
+        return None if path is None else path[-1].value
+
+    def remove(self, prefix, length):
+        path = self._path(prefix, length)
+        if path is None or path[-1].value is None:
+            return None
+        node = path[-1]
+        value, node.value = node.value, None
+        for parent in path:
+            parent.count -= 1
+        # Drop or bypass nodes that no longer hold a value or split two branches.
+        while len(path) > 1 and node.value is None:
+            parent = path[-2]
+            children = [c for c in (node.zero, node.one) if c is not None]
+            if len(children) == 2:
+                break
+            parent.set_child(self._bit(node.prefix, parent.length), children[0] if children else None)
+            path.pop()
+            node = parent
+        return value
+
+    def covering(self, prefix, length):
+        """Stored prefixes that contain ``prefix/length`` (including itself), shortest first."""
+        found = []
+        node = self.root
+        while True:
+            if node.value is not None:
+                found.append(node)
+            if node.length >= length:
+                return found
+            node = node.child(self._bit(prefix, node.length))
+            if node is None or node.length > length or self._common(node.prefix, prefix, node.length) < node.length:
+                return found
+
+    def within(self, prefix, length):
+        """Stored prefixes inside ``prefix/length`` (including itself), in address order."""
+        node = self.root
+        while node.length < length:
+            node = node.child(self._bit(prefix, node.length))
+            if node is None:
+                return
+            if self._common(node.prefix, prefix, min(node.length, length)) < min(node.length, length):
+                return
+        yield from self._walk(node)
+
+    def _walk(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                yield node
+            if node.one is not None:
+                stack.append(node.one)
+            if node.zero is not None:
+                stack.append(node.zero)
+
+    def __iter__(self):
+        return self._walk(self.root)
+
+    def walk_from(self, index):
+        """Stored prefixes in address order, starting with the ``index``-th; O(width) to get there."""
+        if index >= self.root.count:
+            return
+        # Descend by subtree counts, remembering the right-hand branches still to visit.
+        pending = []
+        node = self.root
+        while True:
+            if node.value is not None:
+                if index == 0:
+                    break
+                index -= 1
+            if node.zero is not None and index < node.zero.count:
+                if node.one is not None:
+                    pending.append(node.one)
+                node = node.zero
+            else:
+                if node.zero is not None:
+                    index -= node.zero.count
+                node = node.one
+        pending.append(node)
+        while pending:
+            node = pending.pop()
+            if node.value is not None:
+                yield node
+            if node.one is not None:
+                pending.append(node.one)
+            if node.zero is not None:
+                pending.append(node.zero)
+
+
+class IPBanIndex:
+    """IPv4 and IPv6 bans keyed by CIDR range, in one radix trie per family.
+
+    ``covering`` answers "is this address banned" in O(prefix length);
+    ``overlapping`` also finds narrower bans inside a range, and ``merged``
+    collapses nested and adjacent ranges. Single addresses are /32 or /128.
+    """
+
+    def __init__(self):
+        self._tries = {4: _RadixTrie(32), 6: _RadixTrie(128)}
+        self._merged = None  # cached ``merged()``; cleared whenever a ban changes
+        self.loaded = False
+        self.seq = 0  # the storage change number the index is current with
+
+    def __len__(self):
+        return sum(trie.size for trie in self._tries.values())
+
+    @staticmethod
+    def parse(text):
+        """An ``ip_network`` for an address or CIDR range; host bits are dropped. Raises ValueError."""
+        network = ipaddress.ip_network(text.strip(), strict=False)
+        if network.version == 6 and network.prefixlen == 128 and network.network_address.ipv4_mapped:
+            network = ipaddress.ip_network(network.network_address.ipv4_mapped)
+        return network
+
+    @staticmethod
+    def key(network):
+        # Stored as a plain address for single hosts, so bans saved before ranges existed still match.
+        if network.prefixlen == network.max_prefixlen:
+            return str(network.network_address)
+        return str(network)
+
+    def _network(self, version, node):
+        cls = ipaddress.IPv4Network if version == 4 else ipaddress.IPv6Network
+        return cls((node.prefix, node.length))
+
+    def _locate(self, network):
+        return self._tries[network.version], int(network.network_address), network.prefixlen
+
+    def add(self, network, value):
+        trie, prefix, length = self._locate(network)
+        trie.insert(prefix, length, value)
+        self._merged = None
+
+    def remove(self, network):
+        trie, prefix, length = self._locate(network)
+        self._merged = None
+        return trie.remove(prefix, length)
+
+    def get(self, network):
+        trie, prefix, length = self._locate(network)
+        return trie.get(prefix, length)
+
+    def covering(self, network):
+        """``[(network, value)]`` for every ban containing ``network``, broadest first."""
+        trie, prefix, length = self._locate(network)
+        return [(self._network(network.version, n), n.value) for n in trie.covering(prefix, length)]
+
+    def overlapping(self, network):
+        """Bans that contain ``network`` or lie inside it."""
+        trie, prefix, length = self._locate(network)
+        nodes = trie.covering(prefix, length)
+        nodes.extend(n for n in trie.within(prefix, length) if n.length > length)
+        return [(self._network(network.version, n), n.value) for n in nodes]
+
+    def _nodes(self):
+        for version, trie in self._tries.items():
+            for node in trie:
+                yield version, node
+
+    def items(self):
+        """Every ``(network, value)``, IPv4 then IPv6, in address order."""
+        for version, node in self._nodes():
+            yield self._network(version, node), node.value
+
+    def page(self, offset, limit):
+        """``limit`` entries of ``items()`` from ``offset`` on, found through subtree counts rather than skipped."""
+        found = []
+        for version, trie in self._tries.items():
+            if offset >= trie.size:
+                offset -= trie.size
+                continue
+            for node in itertools.islice(trie.walk_from(offset), limit - len(found)):
+                found.append((self._network(version, node), node.value))
+            if len(found) == limit:
+                break
+            offset = 0
+        return found
+
+    def merged(self):
+        """The banned address space as ``(version, first, last)`` integer spans in address order.
+
+        Nested and adjacent bans are combined; ``describe`` turns a span into text.
+        The list is cached until the next ban changes, so don't modify it.
+        """
+        if self._merged is None:
+            self._merged = self._merge()
+        return self._merged
+
+    def _merge(self):
+        spans = []
+        for version, trie in self._tries.items():
+            start = end = None
+            for node in trie:
+                first = node.prefix
+                last = first + (1 << (trie.width - node.length)) - 1
+                if start is not None and first <= end + 1:
+                    end = max(end, last)
+                    continue
+                if start is not None:
+                    spans.append((version, start, end))
+                start, end = first, last
+            if start is not None:
+                spans.append((version, start, end))
+        return spans
+
+    @staticmethod
+    def describe(version, first, last):
+        cls = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+        networks = list(itertools.islice(ipaddress.summarize_address_range(cls(first), cls(last)), 2))
+        if len(networks) == 1:
+            return IPBanIndex.key(networks[0])
+        return f"{cls(first)} – {cls(last)}"
+
+    def load(self, bans):
+        """Index stored bans (``{key: {"user_id", "reason", "moderator"}}``); returns keys that don't parse."""
+        invalid = []
+        for key, ban in bans.items():
+            try:
+                network = self.parse(key)
+            except ValueError:
+                invalid.append(key)
+                continue
+            self.add(network, (key, ban["user_id"], ban["reason"], ban["moderator"]))
+        self.loaded = True
+        return invalid
+
+    def apply(self, changes, seq):
+        """Catch up to storage change ``seq``; ``changes`` maps keys to their ban, or None if removed."""
+        for key, ban in changes.items():
+            try:
+                network = self.parse(key)
+            except ValueError:
+                continue
+            if ban is None:
+                self.remove(network)
+            else:
+                self.add(network, (key, ban["user_id"], ban["reason"], ban["moderator"]))
+        self.seq = max(self.seq, seq)
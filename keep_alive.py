@@ -1,16 +1,51 @@
-from flask import Flask
-from threading import Thread
+import json
+import math
 import os
+import time
 
-app = Flask('')
+from aiohttp import web
 
-@app.route('/')
-def home():
-    return "I'm alive!"
+# Report unhealthy when no gateway event has arrived for this long (0 disables the check).
+HEALTH_STALE_AFTER = float(os.environ.get("HEALTH_STALE_AFTER", "0"))
 
-def run():
-    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
 
-def keep_alive():
-    t = Thread(target=run)
-    t.start()
+def health(bot):
+    latency = bot.latency
+    connected = bot.is_ready() and not bot.is_closed() and math.isfinite(latency)
+    age = None if bot.last_event_at is None else time.monotonic() - bot.last_event_at
+    stale = HEALTH_STALE_AFTER > 0 and (age is None or age > HEALTH_STALE_AFTER)
+    return {
+        "status": "ok" if connected and not stale else "unhealthy",
+        "connected": connected,
+        "latency_ms": round(latency * 1000, 1) if math.isfinite(latency) else None,
+        "last_event_age_s": None if age is None else round(age, 1),
+        "guilds": len(bot.guilds),
+        "shards": sorted(bot.shards) if hasattr(bot, "shards") else None,
+    }
+
+
+async def keep_alive(bot, host="0.0.0.0", port=None):
+    """Serve /healthz and /metrics from the bot's own event loop. Returns the runner to clean up."""
+
+    async def home(request):
+        return web.Response(text="I'm alive!")
+
+    async def healthz(request):
+        report = health(bot)
+        return web.Response(
+            text=json.dumps(report), content_type="application/json",
+            status=200 if report["status"] == "ok" else 503,
+        )
+
+    async def metrics(request):
+        return web.Response(text=bot.metrics.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/", home)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port or int(os.environ.get('PORT', 8080)))
+    await site.start()
+    return runner
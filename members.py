@@ -0,0 +1,81 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Annotated
+
+import discord
+from discord.ext import commands
+
+_MISSING = object()
+
+
+class MemberLookup:
+    """Small LRU of members fetched on demand when the member cache is disabled.
+
+    Misses fall back to the API; members who have left are remembered as None
+    so repeated lookups don't refetch them. Entries expire after ``ttl``
+    seconds because no member update events arrive for uncached members.
+    """
+
+    def __init__(self, max_size=2048, ttl=120.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._members = OrderedDict()
+
+    def __len__(self):
+        return len(self._members)
+
+    def peek(self, guild_id, user_id):
+        key = (guild_id, user_id)
+        entry = self._members.get(key)
+        if entry is None:
+            return _MISSING
+        member, expires = entry
+        if expires < time.monotonic():
+            del self._members[key]
+            return _MISSING
+        self._members.move_to_end(key)
+        return member
+
+    def remember(self, guild_id, user_id, member):
+        self._members[(guild_id, user_id)] = (member, time.monotonic() + self.ttl)
+        self._members.move_to_end((guild_id, user_id))
+        while len(self._members) > self.max_size:
+            self._members.popitem(last=False)
+
+    def forget(self, guild_id, user_id):
+        self._members.pop((guild_id, user_id), None)
+
+    async def get(self, guild, user_id):
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        member = self.peek(guild.id, user_id)
+        if member is not _MISSING:
+            return member
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            member = None
+        self.remember(guild.id, user_id, member)
+        return member
+
+
+class CachedMemberConverter(commands.MemberConverter):
+    """MemberConverter that checks ``bot.members`` before querying Discord by ID."""
+
+    async def convert(self, ctx, argument):
+        lookup = getattr(ctx.bot, "members", None)
+        match = re.match(r"<@!?([0-9]{15,20})>$|([0-9]{15,20})$", argument)
+        if lookup is not None and ctx.guild is not None and match:
+            user_id = int(match.group(1) or match.group(2))
+            member = ctx.guild.get_member(user_id) or lookup.peek(ctx.guild.id, user_id)
+            if isinstance(member, discord.Member):
+                return member
+        member = await super().convert(ctx, argument)
+        if lookup is not None and ctx.guild is not None:
+            lookup.remember(ctx.guild.id, member.id, member)
+        return member
+
+
+Member = Annotated[discord.Member, CachedMemberConverter]
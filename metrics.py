@@ -0,0 +1,211 @@
+import logging
+import math
+import time
+
+from tracing import LatencyTracker, LoopLagMonitor
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Metrics:
+    """Minimal in-process metrics registry rendered in Prometheus text format.
+
+    Counters and histograms are updated inline; gauges are callbacks evaluated
+    at scrape time and may return a number or ``{label_value: number}``.
+    """
+
+    def __init__(self):
+        self._help = {}
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def gauge(self, name, help_text, callback, label=None, kind="gauge"):
+        # kind="counter" for callbacks that read a cumulative count kept elsewhere.
+        self._help[name] = help_text
+        self._gauges[name] = (callback, label, kind)
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def render(self):
+        lines = []
+        seen = set()
+
+        def header(name, kind):
+            if name not in seen:
+                seen.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(self._counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), hist in sorted(self._histograms.items(), key=lambda item: item[0]):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {hist.count}")
+            lines.append(f"{name}_sum{_labels(labels)} {hist.total}")
+            lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+        for name, (callback, label, kind) in sorted(self._gauges.items()):
+            try:
+                value = callback()
+            except Exception:
+                continue
+            header(name, kind)
+            if isinstance(value, dict):
+                for label_value, v in sorted(value.items()):
+                    lines.append(f"{name}{_labels(((label, label_value),))} {v}")
+            else:
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class RateLimitCounter(logging.Handler):
+    """Counts the 429 warnings discord.py's HTTP client logs before retrying."""
+
+    def __init__(self, metrics):
+        super().__init__(logging.WARNING)
+        self.metrics = metrics
+
+    def emit(self, record):
+        # Every 429 logs "We are being rate limited"; a global one then logs "Global rate limit"
+        # straight after, without yielding to the loop, so move that 429 over rather than count it twice.
+        if isinstance(record.msg, str) and record.msg.startswith("We are being rate limited"):
+            self.metrics.inc("volt_rest_429_total", scope="route")
+        elif isinstance(record.msg, str) and record.msg.startswith("Global rate limit"):
+            self.metrics.inc("volt_rest_429_total", -1, scope="route")
+            self.metrics.inc("volt_rest_429_total", scope="global")
+
+
+def instrument_bot(bot, slow_threshold=1.0, stall_after=0.25):
+    """Attach ``bot.metrics``, ``bot.tracker`` and ``bot.loop_monitor`` and the hooks that feed them."""
+    metrics = bot.metrics = Metrics()
+    tracker = bot.tracker = LatencyTracker(metrics, slow_threshold)
+    monitor = bot.loop_monitor = LoopLagMonitor(metrics, stall_after=stall_after)
+    bot.last_event_at = None
+    metrics.describe("volt_gateway_events_total", "Gateway dispatch events received, by type.")
+    metrics.describe("volt_commands_total", "Commands completed, by command and outcome.")
+    metrics.describe("volt_command_seconds", "Command handler latency.")
+    metrics.describe("volt_listener_seconds", "Event listener latency, by listener.")
+    metrics.describe("volt_loop_lag_seconds", "How late the event loop ran a timer scheduled for now.")
+    metrics.describe("volt_loop_stalls_total", "Times the event loop was blocked past the stall threshold.")
+    metrics.describe("volt_rest_429_total", "REST responses that were rate limited (HTTP 429).")
+    logging.getLogger("discord.http").addHandler(RateLimitCounter(metrics))
+
+    async def on_socket_event_type(event_type):
+        bot.last_event_at = time.monotonic()
+        metrics.inc("volt_gateway_events_total", type=event_type)
+
+    # Invoke hooks rather than an on_command_error listener, which would silence
+    # discord.py's default error printing.
+    async def before_invoke(ctx):
+        ctx.started_at = time.perf_counter()
+
+    async def after_invoke(ctx):
+        name = ctx.command.qualified_name
+        metrics.inc("volt_commands_total", command=name, status="error" if ctx.command_failed else "ok")
+        tracker.record("command", name, time.perf_counter() - ctx.started_at)
+
+    # Failed checks and conversions never reach the invoke hooks, so count them
+    # here, then fall through to the default handler.
+    default_error_handler = bot.on_command_error
+
+    async def on_command_error(ctx, error):
+        if ctx.command is not None and getattr(ctx, "started_at", None) is None:
+            metrics.inc("volt_commands_total", command=ctx.command.qualified_name, status="rejected")
+        await default_error_handler(ctx, error)
+
+    # Every listener, cog or not, runs through Client._run_event.
+    run_event = bot._run_event
+
+    async def traced_run_event(coro, event_name, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            await run_event(coro, event_name, *args, **kwargs)
+        finally:
+            name = getattr(coro, "__qualname__", event_name).replace(".<locals>", "")
+            tracker.record("listener", name, time.perf_counter() - started)
+
+    bot.add_listener(on_socket_event_type)
+    bot.before_invoke(before_invoke)
+    bot.after_invoke(after_invoke)
+    bot.on_command_error = on_command_error
+    bot._run_event = traced_run_event
+    monitor.start()
+
+    def cog_attr(cog_name, fn):
+        def read():
+            cog = bot.get_cog(cog_name)
+            return fn(cog) if cog is not None else 0
+        return read
+
+    metrics.gauge("volt_latency_seconds", "Gateway heartbeat latency.",
+                  lambda: bot.latency if math.isfinite(bot.latency) else -1)
+    metrics.gauge("volt_guilds", "Guilds visible to this process.", lambda: len(bot.guilds))
+    metrics.gauge("volt_cached_users", "Users in the client cache.", lambda: len(bot.users))
+    metrics.gauge("volt_cached_members", "Members in the member cache.", lambda: sum(len(g.members) for g in bot.guilds))
+    metrics.gauge("volt_member_lookup_entries", "Members held by the on-demand lookup LRU.", lambda: len(bot.members))
+    metrics.gauge("volt_pending_writes", "Changes buffered but not yet persisted, by buffer.", lambda: {
+        "levels": cog_attr("Leveling", lambda c: c.store.pending)(),
+        "modlog": cog_attr("Moderation", lambda c: c.modlog.pending)(),
+    }, label="buffer")
+    metrics.gauge("volt_cache_entries", "Entries in in-memory caches, by cache.", lambda: {
+        "rankings": cog_attr("Leveling", lambda c: sum(len(r) for r in c.rankings.values()))(),
+        "ban_index": cog_attr("Moderation", lambda c: sum(len(i) for i in c.ban_indexes.values()))(),
+        "xp_cooldowns": cog_attr("Leveling", lambda c: sum(len(t) for t in c.cooldowns.values()))(),
+        "activity_members": cog_attr("ActivityWatcher", lambda c: len(c.tracker))(),
+        "automod_matchers": cog_attr("AutoMod", lambda c: len(c.matchers))(),
+        "image_results": cog_attr("Fun", lambda c: c.converter.cache_size)(),
+    }, label="cache")
+    metrics.gauge("volt_pipeline_stage_seconds", "Cumulative time spent in each message pipeline stage.",
+                  lambda: {name: stats.total for name, stats in bot.pipeline.stats.items()}, label="stage")
+    metrics.gauge("volt_loop_lag_worst_seconds", "Worst event loop lag seen since startup.", lambda: monitor.worst_lag)
+    metrics.gauge("volt_outbound_queued", "Messages waiting in the outbound send queues.", lambda: bot.outbound.queued)
+    metrics.gauge("volt_outbound_messages_total", "Outbound messages by outcome (sent, merged into another, shed, failed).",
+                  lambda: dict(bot.outbound.stats), label="outcome", kind="counter")
+    metrics.gauge("volt_image_jobs", "Image conversions queued or running.", cog_attr("Fun", lambda c: c.converter.queued))
+    return metrics
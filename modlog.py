@@ -0,0 +1,82 @@
+import asyncio
+
+import discord
+
+from outbound import LOG
+
+EMBEDS_PER_MESSAGE = 10
+
+
+class ModLogDispatcher:
+    """Per-guild queue of mod-log embeds, delivered in batches off the command path.
+
+    ``enqueue`` returns immediately. The first entry for a guild starts a
+    short timer; when it fires, everything queued by then is sent as messages
+    of up to 10 embeds. The log channel ID is cached per guild and must be
+    invalidated when channels are created, deleted or renamed.
+    """
+
+    def __init__(self, bot, channel_name="mod-logs", delay=2.0, max_pending=500):
+        self.bot = bot
+        self.channel_name = channel_name
+        self.delay = delay
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._channel_ids = {}
+        self._queues = {}
+        self._tasks = {}
+
+    @property
+    def pending(self):
+        return sum(len(q) for q in self._queues.values())
+
+    def invalidate(self, guild_id):
+        self._channel_ids.pop(guild_id, None)
+
+    def get_channel(self, guild):
+        if guild.id not in self._channel_ids:
+            channel = discord.utils.get(guild.text_channels, name=self.channel_name)
+            self._channel_ids[guild.id] = channel.id if channel else None
+        channel_id = self._channel_ids[guild.id]
+        return guild.get_channel(channel_id) if channel_id else None
+
+    def enqueue(self, guild, embed):
+        if self.get_channel(guild) is None:
+            return
+        queue = self._queues.setdefault(guild.id, [])
+        if len(queue) >= self.max_pending:
+            queue.pop(0)
+            self.dropped += 1
+        queue.append(embed)
+        if guild.id not in self._tasks:
+            self._tasks[guild.id] = asyncio.create_task(self._flush_later(guild.id))
+
+    async def _flush_later(self, guild_id):
+        try:
+            await asyncio.sleep(self.delay)
+            await self._flush(guild_id)
+        finally:
+            self._tasks.pop(guild_id, None)
+
+    async def _flush(self, guild_id):
+        while self._queues.get(guild_id):
+            guild = self.bot.get_guild(guild_id)
+            channel = self.get_channel(guild) if guild else None
+            if channel is None:
+                self._queues.pop(guild_id, None)
+                return
+            queue = self._queues[guild_id]
+            batch = queue[:EMBEDS_PER_MESSAGE]
+            del queue[:EMBEDS_PER_MESSAGE]
+            try:
+                await self.bot.outbound.send(channel, embeds=batch, priority=LOG)
+            except discord.HTTPException as e:
+                print(f"[modlog] Failed to deliver {len(batch)} log entries in guild {guild_id}: {e}")
+        self._queues.pop(guild_id, None)
+
+    async def close(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+        for guild_id in list(self._queues):
+            await self._flush(guild_id)
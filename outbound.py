@@ -0,0 +1,216 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from discord.ext import commands
+
+# Lower numbers go first. Replies and mod logs are never shed.
+REPLY = 0
+LOG = 1
+NOTICE = 2  # short-lived warnings, e.g. AutoMod
+ANNOUNCE = 3  # level-ups, poll results
+
+SHEDDABLE = (NOTICE, ANNOUNCE)
+MAX_CONTENT = 2000
+IDLE_SWEEP_AT = 256  # channel queues kept before idle ones are swept
+
+
+class TokenBucket:
+    __slots__ = ("rate", "per", "tokens", "updated")
+
+    def __init__(self, rate, per):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    def wait_time(self, now):
+        self.refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) * self.per / self.rate
+
+
+class _Item:
+    __slots__ = ("priority", "seq", "channel", "content", "kwargs", "sender", "future", "followers")
+
+    def __init__(self, priority, seq, channel, content, kwargs, sender, future):
+        self.priority = priority
+        self.seq = seq
+        self.channel = channel
+        self.content = content
+        self.kwargs = kwargs
+        self.sender = sender
+        self.future = future
+        self.followers = []  # futures of texts merged into this one
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    @property
+    def merge_key(self):
+        # Only plain-text announcements with identical options can share a message.
+        if self.priority not in SHEDDABLE or self.sender is not None or not isinstance(self.content, str):
+            return None
+        if set(self.kwargs) - {"delete_after"}:
+            return None
+        return self.priority, self.kwargs.get("delete_after")
+
+
+class _ChannelQueue:
+    __slots__ = ("heap", "bucket", "task")
+
+    def __init__(self, rate, per):
+        self.heap = []
+        self.bucket = TokenBucket(rate, per)
+        self.task = None
+
+
+class OutboundScheduler:
+    """Per-channel send queues ordered by priority and paced by a token bucket.
+
+    ``send`` returns a future for the sent message (None if it was shed or
+    merged into another). Each channel gets ``rate`` sends per ``per`` seconds,
+    matching Discord's per-channel message limit, so bursts wait here instead
+    of tripping 429s. Queued NOTICE/ANNOUNCE texts for the same channel are
+    merged into one message, and when a queue is ``max_depth`` deep the newest
+    of them are shed to make room. Failures of REPLY/LOG sends propagate to
+    whoever awaits them; failures of the fire-and-forget kinds are printed.
+    """
+
+    def __init__(self, rate=5, per=5.0, max_depth=25):
+        self.rate = rate
+        self.per = per
+        self.max_depth = max_depth
+        self.stats = {"sent": 0, "merged": 0, "shed": 0, "failed": 0}
+        self._queues = {}
+        self._seq = itertools.count()
+
+    @property
+    def queued(self):
+        return sum(len(q.heap) for q in self._queues.values())
+
+    def send(self, channel, content=None, *, priority=ANNOUNCE, sender=None, **kwargs):
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            if len(self._queues) >= IDLE_SWEEP_AT:
+                self._sweep()
+            queue = self._queues[channel.id] = _ChannelQueue(self.rate, self.per)
+        item = _Item(priority, next(self._seq), channel, content, kwargs, sender, future)
+        if self._merge(queue, item):
+            return future
+        if len(queue.heap) >= self.max_depth and not self._make_room(queue, item):
+            self._shed(item)
+            return future
+        heapq.heappush(queue.heap, item)
+        if queue.task is None:
+            queue.task = asyncio.create_task(self._drain(channel.id, queue))
+        return future
+
+    def _merge(self, queue, item):
+        # Append to the newest queued text with the same options, if it still fits.
+        key = item.merge_key
+        if key is None:
+            return False
+        candidates = [q for q in queue.heap if q.merge_key == key]
+        if not candidates:
+            return False
+        target = max(candidates)
+        if len(target.content) + 1 + len(item.content) > MAX_CONTENT:
+            return False
+        target.content += "\n" + item.content
+        target.followers.append(item.future)
+        self.stats["merged"] += 1
+        return True
+
+    def _sweep(self):
+        # Idle channels are only kept while their bucket is still refilling.
+        now = time.monotonic()
+        for channel_id, queue in list(self._queues.items()):
+            if queue.task is None and not queue.heap:
+                queue.bucket.refill(now)
+                if queue.bucket.tokens >= self.rate:
+                    del self._queues[channel_id]
+
+    def _make_room(self, queue, item):
+        # Drop the newest queued item that is less important than the incoming one.
+        victims = [q for q in queue.heap if q.priority in SHEDDABLE and q.priority >= item.priority]
+        if not victims:
+            return item.priority not in SHEDDABLE
+        victim = max(victims)
+        queue.heap.remove(victim)
+        heapq.heapify(queue.heap)
+        self._shed(victim)
+        return True
+
+    def _shed(self, item):
+        self.stats["shed"] += 1 + len(item.followers)
+        for future in (item.future, *item.followers):
+            if not future.done():
+                future.set_result(None)
+
+    async def _drain(self, channel_id, queue):
+        try:
+            while queue.heap:
+                wait = queue.bucket.wait_time(time.monotonic())
+                if wait:
+                    await asyncio.sleep(wait)
+                    continue
+                item = heapq.heappop(queue.heap)
+                queue.bucket.tokens -= 1
+                await self._deliver(item)
+        finally:
+            queue.task = None
+
+    async def _deliver(self, item):
+        try:
+            message = await (item.sender or item.channel.send)(item.content, **item.kwargs)
+        except Exception as e:
+            self.stats["failed"] += 1
+            if item.priority in SHEDDABLE:
+                print(f"[outbound] Failed to send to channel {item.channel.id}: {e}")
+                for future in (item.future, *item.followers):
+                    if not future.done():
+                        future.set_result(None)
+            elif not item.future.done():
+                item.future.set_exception(e)
+            return
+        self.stats["sent"] += 1
+        if not item.future.done():
+            item.future.set_result(message)
+        for future in item.followers:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self):
+        for queue in list(self._queues.values()):
+            if queue.task is not None:
+                queue.task.cancel()
+            for item in queue.heap:
+                for future in (item.future, *item.followers):
+                    future.cancel()
+        self._queues.clear()
+
+
+class OutboundContext(commands.Context):
+    """Command context whose replies go through ``bot.outbound`` at REPLY priority."""
+
+    async def send(self, content=None, **kwargs):
+        return await self.bot.outbound.send(self.channel, content, priority=REPLY, sender=super().send, **kwargs)
+
+
+class OutboundBotMixin:
+    async def get_context(self, origin, *, cls=OutboundContext):
+        return await super().get_context(origin, cls=cls)
+
+
+class VoltBot(OutboundBotMixin, commands.Bot):
+    pass
+
+
+class VoltShardedBot(OutboundBotMixin, commands.AutoShardedBot):
+    pass
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import tempfile
+
+
+def atomic_write(path, text):
+    # Write to a temp file in the same directory and rename it over the target,
+    # so a crash mid-write never leaves a truncated file behind.
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class WriteBehindBuffer:
+    """Guild-keyed ``{guild_id: {user_id: value}}`` data kept in memory and persisted lazily.
+
+    Callers mutate ``data`` directly and call ``mark_dirty(guild_id, user_id)``.
+    A background task hands the dirty rows to ``sink`` every ``flush_interval``
+    seconds (the durability window) or as soon as ``flush_threshold`` changes
+    are pending, so the per-message cost is an in-memory update only.
+    """
+
+    def __init__(self, sink, flush_interval=5.0, flush_threshold=500):
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.data = {}
+        self._dirty = {}
+        self._pending = 0
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._closing = False
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def mark_dirty(self, guild_id, user_id):
+        self._dirty.setdefault(str(guild_id), set()).add(str(user_id))
+        self._pending += 1
+        if self._pending >= self.flush_threshold:
+            self._wakeup.set()
+
+    def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._closing:
+                return
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[persistence] Failed to flush: {e}")
+
+    async def flush(self):
+        async with self._lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, {}
+            self._pending = 0
+            # Copy the values on the loop so the sink never sees a dict mid-mutation.
+            rows = {g: {u: self.data[g][u] for u in users} for g, users in dirty.items()}
+            try:
+                await self.sink(rows)
+            except BaseException:
+                for g, users in dirty.items():
+                    self._dirty.setdefault(g, set()).update(users)
+                    self._pending += len(users)
+                raise
+
+    async def close(self):
+        # Signal rather than cancel: wait_for can swallow a cancellation that
+        # races with the wakeup event, which would leave close() waiting forever.
+        if self._task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
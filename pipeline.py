@@ -0,0 +1,82 @@
+import time
+
+from wordfilter import normalize
+
+# Stage order: lower runs first.
+FILTER = 100
+MODERATION = 200
+XP = 300
+OTHER = 400
+
+
+class MessageContext:
+    """Per-message state shared by every pipeline stage."""
+
+    __slots__ = ("message", "content", "normalized", "stopped", "data")
+
+    def __init__(self, message):
+        self.message = message
+        self.content = message.content
+        self.normalized = normalize(message.content)
+        self.stopped = False
+        self.data = {}
+
+    def stop(self):
+        """Skip every remaining stage, e.g. after the message was deleted."""
+        self.stopped = True
+
+
+class StageStats:
+    __slots__ = ("calls", "total", "worst")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def record(self, elapsed):
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.worst:
+            self.worst = elapsed
+
+
+class MessagePipeline:
+    """Runs registered stages in order for every guild message from a human.
+
+    Cogs register ``async def stage(ctx: MessageContext)`` callbacks with an
+    order (``FILTER``, ``MODERATION``, ``XP``, ``OTHER``); a stage calls
+    ``ctx.stop()`` to short-circuit the rest.
+    """
+
+    def __init__(self):
+        self._stages = []
+        self.stats = {}
+
+    def register(self, order, name, callback):
+        self.unregister(name)
+        self._stages.append((order, name, callback))
+        self._stages.sort(key=lambda s: (s[0], s[1]))
+        self.stats.setdefault(name, StageStats())
+
+    def unregister(self, name):
+        self._stages = [s for s in self._stages if s[1] != name]
+
+    @property
+    def stages(self):
+        return [(order, name) for order, name, _ in self._stages]
+
+    async def dispatch(self, message):
+        if message.author.bot or message.guild is None or not self._stages:
+            return
+        ctx = MessageContext(message)
+        for _, name, callback in self._stages:
+            start = time.perf_counter()
+            try:
+                await callback(ctx)
+            except Exception as e:
+                print(f"[pipeline] Stage {name} failed: {e}")
+            finally:
+                self.stats[name].record(time.perf_counter() - start)
+            if ctx.stopped:
+                break
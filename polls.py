@@ -0,0 +1,67 @@
+import re
+import time
+
+NUMBER_EMOJIS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
+YES_NO_EMOJIS = ["👍", "👎"]
+BAR_WIDTH = 12
+
+_DURATION = re.compile(r"^(\d+)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(text):
+    """Seconds for ``30m``/``2h``/``1d`` style text, or None if it isn't one."""
+    match = _DURATION.match(text.lower())
+    if not match:
+        return None
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+class Poll:
+    """One poll's options and live tallies, kept in memory and saved as a document."""
+
+    __slots__ = ("message_id", "channel_id", "guild_id", "question", "options", "emojis", "counts", "ends_at")
+
+    def __init__(self, message_id, channel_id, guild_id, question, options, emojis, ends_at, counts=None):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.question = question
+        self.options = options
+        self.emojis = emojis
+        self.ends_at = ends_at
+        self.counts = counts or [0] * len(options)
+
+    @classmethod
+    def from_document(cls, data):
+        return cls(
+            data["message_id"], data["channel_id"], data["guild_id"], data["question"],
+            data["options"], data["emojis"], data["ends_at"], data["counts"],
+        )
+
+    def to_document(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def tally(self, emoji, change):
+        """Apply a reaction add (+1) or remove (-1). Returns False for emojis that aren't options."""
+        try:
+            index = self.emojis.index(emoji)
+        except ValueError:
+            return False
+        self.counts[index] = max(0, self.counts[index] + change)
+        return True
+
+    @property
+    def ended(self):
+        return time.time() >= self.ends_at
+
+    def render(self):
+        total = sum(self.counts)
+        lines = []
+        for emoji, option, count in zip(self.emojis, self.options, self.counts):
+            share = count / total if total else 0
+            filled = round(share * BAR_WIDTH)
+            lines.append(f"{emoji} **{option}**\n`{'█' * filled}{'░' * (BAR_WIDTH - filled)}` {count} ({share:.0%})")
+        when = f"Ended <t:{int(self.ends_at)}:R>" if self.ended else f"Ends <t:{int(self.ends_at)}:R>"
+        lines.append(f"\n{total} vote(s) • {when}")
+        return "\n".join(lines)
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import discord
+
+BULK_CHUNK = 100
+# Bulk delete rejects anything older than 14 days; keep a margin for clock skew.
+BULK_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+
+class PurgeStats:
+    __slots__ = ("scanned", "matched", "deleted", "old", "failed")
+
+    def __init__(self):
+        self.scanned = 0
+        self.matched = 0
+        self.deleted = 0
+        self.old = 0
+        self.failed = 0
+
+
+async def purge(channel, limit, check=None, before=None, after=None, on_progress=None,
+                progress_interval=3.0, old_concurrency=3):
+    """Stream ``channel`` history once and delete the messages ``check`` accepts.
+
+    Recent messages are bulk-deleted in chunks of 100 while paging continues.
+    Messages past the bulk-delete age go through a separate lane of at most
+    ``old_concurrency`` single deletes. ``on_progress(stats)`` is awaited at
+    most every ``progress_interval`` seconds.
+    """
+    stats = PurgeStats()
+    cutoff = discord.utils.utcnow() - BULK_MAX_AGE
+    batch = []
+    old_lane = asyncio.Semaphore(old_concurrency)
+    old_tasks = set()
+    last_report = time.monotonic()
+
+    async def delete_bulk(messages):
+        try:
+            await channel.delete_messages(messages)
+            stats.deleted += len(messages)
+        except discord.NotFound:
+            # Someone else deleted one of them first; fall back to singles.
+            for message in messages:
+                await delete_one(message)
+        except discord.HTTPException:
+            stats.failed += len(messages)
+
+    async def delete_one(message):
+        try:
+            await message.delete()
+            stats.deleted += 1
+        except discord.NotFound:
+            pass
+        except discord.HTTPException:
+            stats.failed += 1
+
+    async def delete_old(message):
+        try:
+            await delete_one(message)
+        finally:
+            old_lane.release()
+
+    async for message in channel.history(limit=limit, before=before, after=after):
+        stats.scanned += 1
+        if on_progress is not None and time.monotonic() - last_report >= progress_interval:
+            last_report = time.monotonic()
+            await on_progress(stats)
+        if check is not None and not check(message):
+            continue
+        stats.matched += 1
+        if message.created_at > cutoff:
+            batch.append(message)
+            if len(batch) == BULK_CHUNK:
+                await delete_bulk(batch)
+                batch = []
+        else:
+            stats.old += 1
+            await old_lane.acquire()
+            task = asyncio.create_task(delete_old(message))
+            old_tasks.add(task)
+            task.add_done_callback(old_tasks.discard)
+
+    if batch:
+        await delete_bulk(batch)
+    if old_tasks:
+        await asyncio.gather(*old_tasks)
+    return stats
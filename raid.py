@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import discord
+
+
+class JoinRateWindow:
+    """Joins over the last ``window`` seconds, kept in one-second ring buffer slots.
+
+    ``record`` only clears the slots that elapsed since the previous join, so
+    each join costs O(1) on average and memory stays at ``window`` ints per
+    guild however many members arrive.
+    """
+
+    __slots__ = ("slots", "total", "last")
+
+    def __init__(self, window):
+        self.slots = [0] * window
+        self.total = 0
+        self.last = int(time.monotonic())
+
+    def record(self, now=None):
+        """Count one join and return how many happened within the window."""
+        second = int(time.monotonic() if now is None else now)
+        size = len(self.slots)
+        if second - self.last >= size:
+            self.slots = [0] * size
+            self.total = 0
+        else:
+            for elapsed in range(self.last + 1, second + 1):
+                self.total -= self.slots[elapsed % size]
+                self.slots[elapsed % size] = 0
+        self.last = max(self.last, second)
+        self.slots[second % size] += 1
+        self.total += 1
+        return self.total
+
+
+async def lock_channels(channels, role, reason=None, concurrency=10):
+    """Deny ``send_messages`` for ``role`` in every channel, ``concurrency`` edits at a time.
+
+    Returns ``(snapshot, failed)``. The snapshot maps each edited channel ID
+    to the role's previous overwrite as ``[allow, deny]``, or None if it had
+    none, for ``restore_channels``. Channels that already deny sending are
+    left alone and not included.
+    """
+    snapshot = {}
+    failed = []
+    lane = asyncio.Semaphore(concurrency)
+
+    async def lock_one(channel):
+        overwrite = channel.overwrites_for(role)
+        if overwrite.send_messages is False:
+            return
+        previous = [p.value for p in overwrite.pair()] if role in channel.overwrites else None
+        overwrite.send_messages = False
+        async with lane:
+            try:
+                await channel.set_permissions(role, overwrite=overwrite, reason=reason)
+            except discord.HTTPException:
+                failed.append(channel.id)
+                return
+        snapshot[str(channel.id)] = previous
+
+    await asyncio.gather(*(lock_one(c) for c in channels))
+    return snapshot, failed
+
+
+async def restore_channels(guild, role, snapshot, reason=None, concurrency=10):
+    """Put back the overwrites recorded by ``lock_channels``; returns the channel IDs that failed."""
+    failed = []
+    lane = asyncio.Semaphore(concurrency)
+
+    async def restore_one(channel_id, previous):
+        channel = guild.get_channel(int(channel_id))
+        if channel is None:
+            return
+        overwrite = None
+        if previous is not None:
+            overwrite = discord.PermissionOverwrite.from_pair(discord.Permissions(previous[0]), discord.Permissions(previous[1]))
+        async with lane:
+            try:
+                await channel.set_permissions(role, overwrite=overwrite, reason=reason)
+            except discord.HTTPException:
+                failed.append(channel_id)
+
+    await asyncio.gather(*(restore_one(c, p) for c, p in snapshot.items()))
+    return failed
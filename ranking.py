@@ -0,0 +1,46 @@
+from sortedcontainers import SortedList
+
+
+class RankingIndex:
+    """Per-guild XP ordering kept sorted as XP changes.
+
+    Entries are stored as ``(-xp, user_id)`` so the highest XP sorts first and
+    ties break by user ID. Updates and rank lookups are O(log n); fetching a
+    page is O(log n + page size).
+    """
+
+    def __init__(self, levels=None):
+        self._xp = {}
+        self._order = SortedList()
+        if levels:
+            self._xp = {int(u): xp for u, xp in levels.items()}
+            self._order = SortedList((-xp, u) for u, xp in self._xp.items())
+
+    def __len__(self):
+        return len(self._xp)
+
+    def update(self, user_id, xp):
+        user_id = int(user_id)
+        old = self._xp.get(user_id)
+        if old == xp:
+            return
+        if old is not None:
+            self._order.remove((-old, user_id))
+        self._xp[user_id] = xp
+        self._order.add((-xp, user_id))
+
+    def rank(self, user_id):
+        """1-based rank of ``user_id``, or None if they have no XP recorded."""
+        user_id = int(user_id)
+        xp = self._xp.get(user_id)
+        if xp is None:
+            return None
+        return self._order.index((-xp, user_id)) + 1
+
+    def page(self, page, per_page=10):
+        """Return ``[(rank, user_id, xp), ...]`` for a 1-based page number."""
+        start = (page - 1) * per_page
+        return [
+            (start + i + 1, user_id, -neg_xp)
+            for i, (neg_xp, user_id) in enumerate(self._order.islice(start, start + per_page))
+        ]
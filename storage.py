@@ -0,0 +1,712 @@
+import asyncio
+import bisect
+from array import array
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from persistence import atomic_write
+
+WARN_FILE = "warnings.json"
+IP_BAN_FILE = "ip_bans.json"
+LEVELS_FILE = "levels.json"
+AUDIT_FILE = "audit.jsonl"
+AUDIT_FIELDS = ("id", "guild_id", "created_at", "action", "target_id", "target", "moderator_id", "reason")
+DB_FILE = "volt.db"
+SHARED_DB_FILE = "shared.db"
+IP_BAN_CHANGES_KEPT = 10000  # a process further behind than this reloads its IP ban index
+
+
+def load_json(filename):
+    try:
+        with open(filename, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_json(filename, data, compact=False):
+    atomic_write(filename, json.dumps(data, separators=(",", ":")) if compact else json.dumps(data, indent=4))
+
+
+class Storage:
+    """Base class for persistence backends.
+
+    Every public method is a coroutine; the blocking work runs on a single
+    dedicated worker thread so the event loop never touches the disk.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage")
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def open(self):
+        await self._run(self._open)
+
+    async def close(self):
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    def _open(self):
+        pass
+
+    def _close(self):
+        pass
+
+    # Warnings
+    async def add_warning(self, guild_id, user_id, reason, moderator_id=None):
+        moderator_id = None if moderator_id is None else int(moderator_id)
+        await self._run(self._add_warning, int(guild_id), int(user_id), reason, moderator_id, time.time())
+
+    async def get_warnings(self, guild_id, user_id):
+        """Oldest first, as dicts of ``reason``, ``moderator_id`` and ``created_at`` (None for old warnings)."""
+        return await self._run(self._get_warnings, int(guild_id), int(user_id))
+
+    async def remove_warning(self, guild_id, user_id, index):
+        """Remove the 1-based ``index``-th warning. Returns its reason, or None."""
+        return await self._run(self._remove_warning, int(guild_id), int(user_id), index)
+
+    # IP bans
+    async def add_ip_ban(self, ip, user_id, reason, moderator_id):
+        await self._run(self._add_ip_ban, ip, int(user_id), reason, int(moderator_id))
+
+    async def remove_ip_ban(self, ip):
+        """Remove an IP ban. Returns the removed entry, or None."""
+        return await self._run(self._remove_ip_ban, ip)
+
+    async def get_ip_bans(self):
+        return await self._run(self._get_ip_bans)
+
+    async def ip_ban_changes(self, since=None):
+        """IP bans changed by any process after change number ``since``.
+
+        Returns ``(seq, {ip: ban or None})`` where None means removed, and
+        ``seq`` is the number to pass next time. With ``since=None`` only the
+        current number is returned; if ``since`` is too old to replay, the
+        changes are None and the caller must reload everything.
+        """
+        return await self._run(self._ip_ban_changes, since)
+
+    # Levels
+    async def load_levels(self):
+        """Return every stored XP value as ``{guild_id: {user_id: xp}}`` (string keys)."""
+        return await self._run(self._load_levels)
+
+    async def save_levels(self, rows):
+        """Upsert ``{guild_id: {user_id: xp}}``; guilds and users not mentioned are untouched."""
+        await self._run(self._save_levels, rows)
+
+    # Audit log: append-only; entries are dicts with the AUDIT_FIELDS keys.
+    async def append_audit(self, entries):
+        """Append entries (without ``id``, which storage assigns) in one write."""
+        await self._run(self._append_audit, entries)
+
+    async def get_audit(self, guild_id, target_id=None, limit=10, offset=0):
+        """Newest first; narrowed to one target when ``target_id`` is given."""
+        target_id = None if target_id is None else int(target_id)
+        return await self._run(self._get_audit, int(guild_id), target_id, limit, offset)
+
+    async def count_audit(self, guild_id, target_id):
+        return await self._run(self._count_audit, int(guild_id), int(target_id))
+
+    async def audit_stats(self, guild_id, since=None):
+        """``{moderator_id: {action: count}}`` for entries at or after ``since`` (a timestamp), or all time."""
+        return await self._run(self._audit_stats, int(guild_id), since)
+
+    async def iter_audit(self, guild_id, since=None, page_size=1000):
+        """Yield the guild's entries oldest first, one page at a time, so exports never hold the whole log."""
+        after = (since or 0, 0)
+        while True:
+            page = await self._run(self._audit_page, int(guild_id), after, page_size)
+            if not page:
+                return
+            yield page
+            after = (page[-1]["created_at"], page[-1]["id"])
+
+    # Documents: small JSON values keyed by (namespace, key), e.g. per-guild settings.
+    async def get_document(self, namespace, key, default=None):
+        value = await self._run(self._get_document, namespace, str(key))
+        return default if value is None else value
+
+    async def get_documents(self, namespace):
+        """Return every document in ``namespace`` as ``{key: value}``."""
+        return await self._run(self._get_documents, namespace)
+
+    async def set_document(self, namespace, key, value):
+        await self._run(self._set_document, namespace, str(key), value)
+
+    async def delete_document(self, namespace, key):
+        await self._run(self._delete_document, namespace, str(key))
+
+    async def update_documents(self, namespace, changes, merge):
+        """Replace each document in ``{key: change}`` with ``merge(current_or_None, change)`` in one batch.
+
+        ``merge`` runs on the storage thread and must not touch loop-owned state.
+        """
+        await self._run(self._update_documents, namespace, {str(k): v for k, v in changes.items()}, merge)
+
+
+class JsonStorage(Storage):
+    """The original flat-file layout, kept for small deployments and as a migration source.
+
+    The audit log stays on disk and queries read matching lines back by byte
+    offset, but the offset, time and target indexes are rebuilt in memory on
+    open (about 180 bytes an entry at 500k mostly distinct targets, and a full
+    read of the file). Logs meant to reach millions of entries belong on the
+    SQLite backend, whose indexes live on disk.
+    """
+
+    def __init__(self, warn_file, ip_ban_file, levels_file):
+        super().__init__()
+        self.warn_file = warn_file
+        self.ip_ban_file = ip_ban_file
+        self.levels_file = levels_file
+        self._warnings = {}
+        self._ip_bans = {}
+        self._levels = {}
+        self._level_fragments = {}
+        self._documents = {}
+        self.audit_file = os.path.join(os.path.dirname(os.path.abspath(levels_file)), AUDIT_FILE)
+        self._audit_offsets = array("q")  # entry position (id - 1) -> byte offset in audit_file
+        self._audit_times = array("d")  # entry position -> created_at
+        self._audit_by_guild = {}  # guild_id -> positions, oldest first
+        self._audit_by_target = {}  # (guild_id, target_id) -> positions, or a bare int for just one
+
+    def _open(self):
+        self._load_audit()
+        self._warnings = load_json(self.warn_file)
+        self._ip_bans = load_json(self.ip_ban_file)
+        self._levels = load_json(self.levels_file)
+        self._level_fragments = {g: json.dumps(rows) for g, rows in self._levels.items()}
+
+    def _add_warning(self, guild_id, user_id, reason, moderator_id, created_at):
+        warning = {"reason": reason, "moderator_id": moderator_id, "created_at": created_at}
+        self._warnings.setdefault(str(guild_id), {}).setdefault(str(user_id), []).append(warning)
+        save_json(self.warn_file, self._warnings)
+
+    def _get_warnings(self, guild_id, user_id):
+        # Warnings saved before moderators were recorded are bare reason strings.
+        return [
+            w if isinstance(w, dict) else {"reason": w, "moderator_id": None, "created_at": None}
+            for w in self._warnings.get(str(guild_id), {}).get(str(user_id), [])
+        ]
+
+    def _remove_warning(self, guild_id, user_id, index):
+        guild_id, user_id = str(guild_id), str(user_id)
+        user_warnings = self._warnings.get(guild_id, {}).get(user_id, [])
+        if index < 1 or index > len(user_warnings):
+            return None
+        removed = user_warnings.pop(index - 1)
+        if isinstance(removed, dict):
+            removed = removed["reason"]
+        if not user_warnings:
+            self._warnings[guild_id].pop(user_id)
+            if not self._warnings[guild_id]:
+                self._warnings.pop(guild_id)
+        save_json(self.warn_file, self._warnings)
+        return removed
+
+    def _add_ip_ban(self, ip, user_id, reason, moderator_id):
+        self._ip_bans[ip] = {"user_id": user_id, "reason": reason, "moderator": moderator_id}
+        # Ban lists can run to hundreds of thousands of entries; indentation would double the file.
+        save_json(self.ip_ban_file, self._ip_bans, compact=True)
+
+    def _remove_ip_ban(self, ip):
+        removed = self._ip_bans.pop(ip, None)
+        if removed is not None:
+            save_json(self.ip_ban_file, self._ip_bans, compact=True)
+        return removed
+
+    def _get_ip_bans(self):
+        return dict(self._ip_bans)
+
+    def _ip_ban_changes(self, since):
+        # The JSON backend is single-process, so nothing else ever changes the bans.
+        return 0, {}
+
+    def _load_levels(self):
+        return {g: dict(rows) for g, rows in self._levels.items()}
+
+    def _save_levels(self, rows):
+        # Only the touched guilds are re-serialized; the rest reuse their cached fragment.
+        for guild_id, users in rows.items():
+            self._levels.setdefault(guild_id, {}).update(users)
+            self._level_fragments[guild_id] = json.dumps(self._levels[guild_id])
+        body = ",".join(f"{json.dumps(g)}:{frag}" for g, frag in self._level_fragments.items())
+        atomic_write(self.levels_file, "{" + body + "}")
+
+    def _load_audit(self):
+        try:
+            with open(self.audit_file, "rb") as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        self._index_audit(json.loads(line), offset)
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+
+    def _index_audit(self, entry, offset):
+        position = len(self._audit_offsets)
+        self._audit_offsets.append(offset)
+        self._audit_times.append(entry["created_at"])
+        self._audit_by_guild.setdefault(entry["guild_id"], array("q")).append(position)
+        if entry["target_id"] is not None:
+            # Most targets only ever have one entry; an array for each would triple the index.
+            key = (entry["guild_id"], entry["target_id"])
+            positions = self._audit_by_target.get(key)
+            if positions is None:
+                self._audit_by_target[key] = position
+            elif isinstance(positions, int):
+                self._audit_by_target[key] = array("q", (positions, position))
+            else:
+                positions.append(position)
+
+    def _target_positions(self, guild_id, target_id):
+        positions = self._audit_by_target.get((guild_id, target_id), ())
+        return (positions,) if isinstance(positions, int) else positions
+
+    def _read_audit(self, positions):
+        with open(self.audit_file, "rb") as f:
+            entries = []
+            for p in positions:
+                f.seek(self._audit_offsets[p])
+                entries.append(json.loads(f.readline()))
+            return entries
+
+    def _append_audit(self, entries):
+        with open(self.audit_file, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for entry in entries:
+                entry = dict(entry, id=len(self._audit_offsets) + 1)
+                line = (json.dumps(entry) + "\n").encode()
+                f.write(line)
+                self._index_audit(entry, offset)
+                offset += len(line)
+
+    def _get_audit(self, guild_id, target_id, limit, offset):
+        if target_id is None:
+            positions = self._audit_by_guild.get(guild_id, ())
+        else:
+            positions = self._target_positions(guild_id, target_id)
+        end = len(positions) - offset
+        return self._read_audit(reversed(positions[max(0, end - limit):max(0, end)]))
+
+    def _count_audit(self, guild_id, target_id):
+        return len(self._target_positions(guild_id, target_id))
+
+    def _guild_audit_since(self, guild_id, since):
+        positions = self._audit_by_guild.get(guild_id, array("q"))
+        if since is None:
+            return positions
+        # Entries are appended in time order, so each guild's positions are sorted by created_at too.
+        start = bisect.bisect_left(positions, since, key=self._audit_times.__getitem__)
+        return positions[start:]
+
+    def _audit_stats(self, guild_id, since):
+        stats = {}
+        positions = self._guild_audit_since(guild_id, since)
+        # A page at a time, so a long log is never all in memory at once.
+        for start in range(0, len(positions), 1000):
+            for entry in self._read_audit(positions[start:start + 1000]):
+                actions = stats.setdefault(entry["moderator_id"], {})
+                actions[entry["action"]] = actions.get(entry["action"], 0) + 1
+        return stats
+
+    def _audit_page(self, guild_id, after, page_size):
+        positions = self._guild_audit_since(guild_id, after[0])
+        start = bisect.bisect_left(positions, after[1])  # a position is its entry's id - 1
+        return self._read_audit(positions[start:start + page_size])
+
+    def _document_file(self, namespace):
+        return os.path.join(os.path.dirname(os.path.abspath(self.levels_file)), f"{namespace}.json")
+
+    def _namespace(self, namespace):
+        if namespace not in self._documents:
+            self._documents[namespace] = load_json(self._document_file(namespace))
+        return self._documents[namespace]
+
+    def _get_document(self, namespace, key):
+        return self._namespace(namespace).get(key)
+
+    def _get_documents(self, namespace):
+        return dict(self._namespace(namespace))
+
+    def _set_document(self, namespace, key, value):
+        self._namespace(namespace)[key] = value
+        save_json(self._document_file(namespace), self._documents[namespace])
+
+    def _delete_document(self, namespace, key):
+        if self._namespace(namespace).pop(key, None) is not None:
+            save_json(self._document_file(namespace), self._documents[namespace])
+
+    def _update_documents(self, namespace, changes, merge):
+        documents = self._namespace(namespace)
+        for key, change in changes.items():
+            documents[key] = merge(documents.get(key), change)
+        save_json(self._document_file(namespace), documents)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS levels (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    xp INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS warnings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    moderator_id INTEGER,
+    created_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_warnings_member ON warnings (guild_id, user_id, id);
+CREATE TABLE IF NOT EXISTS documents (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    action TEXT NOT NULL,
+    target_id INTEGER,
+    target TEXT NOT NULL,
+    moderator_id INTEGER NOT NULL,
+    reason TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_target ON audit_log (guild_id, target_id, id);
+-- Covers ,modstats: per-moderator action counts never touch the table itself.
+CREATE INDEX IF NOT EXISTS idx_audit_moderator ON audit_log (guild_id, moderator_id, action);
+CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_log (guild_id, created_at);
+CREATE TRIGGER IF NOT EXISTS audit_log_no_update BEFORE UPDATE ON audit_log
+BEGIN SELECT RAISE(ABORT, 'audit_log is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS audit_log_no_delete BEFORE DELETE ON audit_log
+BEGIN SELECT RAISE(ABORT, 'audit_log is append-only'); END;
+"""
+
+# IP bans are global, not per guild. A clustered bot keeps them in one database every cluster
+# opens; ip_ban_changes lets each process catch up on bans the others made.
+IP_BAN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ip_bans (
+    ip TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    moderator_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ip_ban_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ip TEXT NOT NULL
+);
+"""
+
+
+class SQLiteStorage(Storage):
+    """SQLite in WAL mode with one row per (guild, user).
+
+    On first open, any existing JSON files are imported once and the import is
+    recorded in the ``meta`` table. ``guild_filter`` limits that import to the
+    guilds this process owns when the bot runs as several clusters; IP bans
+    then live in ``shared_path``, which all clusters open.
+    """
+
+    def __init__(self, path, legacy_files=None, guild_filter=None, shared_path=None):
+        super().__init__()
+        self.path = path
+        self.legacy_files = legacy_files or {}
+        self.guild_filter = guild_filter or (lambda guild_id: True)
+        self.shared_path = shared_path
+        self._db = None
+        self._shared = None
+
+    def _connect(self, path):
+        # Connections are only ever used from the storage worker thread.
+        db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _open(self):
+        self._db = self._connect(self.path)
+        self._db.executescript(SCHEMA + IP_BAN_SCHEMA)
+        self._shared = self._db
+        if self.shared_path:
+            self._shared = self._connect(self.shared_path)
+            self._shared.executescript(IP_BAN_SCHEMA)
+        self._migrate_schema()
+        self._migrate_json()
+        self._share_ip_bans()
+
+    def _close(self):
+        if self._shared is not None and self._shared is not self._db:
+            self._shared.close()
+        self._shared = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _migrate_schema(self):
+        # Databases created before warnings recorded who issued them and when.
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(warnings)")}
+        if "moderator_id" not in columns:
+            with self._db:
+                self._db.execute("ALTER TABLE warnings ADD COLUMN moderator_id INTEGER")
+                self._db.execute("ALTER TABLE warnings ADD COLUMN created_at REAL")
+
+    def _migrate_json(self):
+        done = self._db.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if done:
+            return
+        owned = self.guild_filter
+        with self._db:
+            warnings = load_json(self.legacy_files.get("warnings", ""))
+            self._db.executemany(
+                "INSERT INTO warnings (guild_id, user_id, reason, moderator_id, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (int(g), int(u), w["reason"], w["moderator_id"], w["created_at"]) if isinstance(w, dict)
+                    else (int(g), int(u), w, None, None)
+                    for g, users in warnings.items() if owned(int(g)) for u, reasons in users.items() for w in reasons
+                ],
+            )
+            ip_bans = load_json(self.legacy_files.get("ip_bans", ""))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO ip_bans (ip, user_id, reason, moderator_id) VALUES (?, ?, ?, ?)",
+                [(ip, int(d["user_id"]), d["reason"], int(d["moderator"])) for ip, d in ip_bans.items()],
+            )
+            levels = load_json(self.legacy_files.get("levels", ""))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO levels (guild_id, user_id, xp) VALUES (?, ?, ?)",
+                [(int(g), int(u), xp) for g, users in levels.items() if owned(int(g)) for u, xp in users.items()],
+            )
+            self._db.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+
+    def _share_ip_bans(self):
+        # Clusters started before IP bans were shared each kept their own copy; fold it in once.
+        if self._shared is self._db:
+            return
+        if self._db.execute("SELECT value FROM meta WHERE key = 'ip_bans_shared'").fetchone():
+            return
+        rows = self._db.execute("SELECT ip, user_id, reason, moderator_id FROM ip_bans").fetchall()
+        with self._shared:
+            self._shared.executemany(
+                "INSERT OR IGNORE INTO ip_bans (ip, user_id, reason, moderator_id) VALUES (?, ?, ?, ?)", rows
+            )
+            self._shared.executemany("INSERT INTO ip_ban_changes (ip) VALUES (?)", [(row[0],) for row in rows])
+        with self._db:
+            self._db.execute("INSERT INTO meta (key, value) VALUES ('ip_bans_shared', '1')")
+
+    def _add_warning(self, guild_id, user_id, reason, moderator_id, created_at):
+        with self._db:
+            self._db.execute(
+                "INSERT INTO warnings (guild_id, user_id, reason, moderator_id, created_at) VALUES (?, ?, ?, ?, ?)",
+                (guild_id, user_id, reason, moderator_id, created_at),
+            )
+
+    def _get_warnings(self, guild_id, user_id):
+        rows = self._db.execute(
+            "SELECT reason, moderator_id, created_at FROM warnings WHERE guild_id = ? AND user_id = ? ORDER BY id",
+            (guild_id, user_id),
+        )
+        return [{"reason": r, "moderator_id": m, "created_at": t} for r, m, t in rows]
+
+    def _remove_warning(self, guild_id, user_id, index):
+        if index < 1:
+            return None
+        row = self._db.execute(
+            "SELECT id, reason FROM warnings WHERE guild_id = ? AND user_id = ? ORDER BY id LIMIT 1 OFFSET ?",
+            (guild_id, user_id, index - 1),
+        ).fetchone()
+        if row is None:
+            return None
+        with self._db:
+            self._db.execute("DELETE FROM warnings WHERE id = ?", (row[0],))
+        return row[1]
+
+    def _log_ip_ban_change(self, ip):
+        seq = self._shared.execute("INSERT INTO ip_ban_changes (ip) VALUES (?)", (ip,)).lastrowid
+        self._shared.execute("DELETE FROM ip_ban_changes WHERE seq <= ?", (seq - IP_BAN_CHANGES_KEPT,))
+
+    def _add_ip_ban(self, ip, user_id, reason, moderator_id):
+        with self._shared:
+            self._shared.execute(
+                "INSERT OR REPLACE INTO ip_bans (ip, user_id, reason, moderator_id) VALUES (?, ?, ?, ?)",
+                (ip, user_id, reason, moderator_id),
+            )
+            self._log_ip_ban_change(ip)
+
+    def _remove_ip_ban(self, ip):
+        with self._shared:
+            row = self._shared.execute("SELECT user_id, reason, moderator_id FROM ip_bans WHERE ip = ?", (ip,)).fetchone()
+            if row is None:
+                return None
+            self._shared.execute("DELETE FROM ip_bans WHERE ip = ?", (ip,))
+            self._log_ip_ban_change(ip)
+        return {"user_id": row[0], "reason": row[1], "moderator": row[2]}
+
+    def _get_ip_bans(self):
+        rows = self._shared.execute("SELECT ip, user_id, reason, moderator_id FROM ip_bans ORDER BY ip")
+        return {ip: {"user_id": u, "reason": r, "moderator": m} for ip, u, r, m in rows}
+
+    def _ip_ban_changes(self, since):
+        oldest, latest = self._shared.execute("SELECT MIN(seq), MAX(seq) FROM ip_ban_changes").fetchone()
+        latest = latest or 0
+        if since is None:
+            return latest, {}
+        if oldest is not None and since < oldest - 1:
+            return latest, None
+        rows = self._shared.execute(
+            "SELECT c.seq, c.ip, b.user_id, b.reason, b.moderator_id FROM ip_ban_changes c "
+            "LEFT JOIN ip_bans b ON b.ip = c.ip WHERE c.seq > ? AND c.seq <= ? ORDER BY c.seq",
+            (since, latest),
+        )
+        changes = {
+            ip: None if user_id is None else {"user_id": user_id, "reason": reason, "moderator": moderator_id}
+            for _, ip, user_id, reason, moderator_id in rows
+        }
+        return latest, changes
+
+    def _load_levels(self):
+        levels = {}
+        for guild_id, user_id, xp in self._db.execute("SELECT guild_id, user_id, xp FROM levels"):
+            levels.setdefault(str(guild_id), {})[str(user_id)] = xp
+        return levels
+
+    def _save_levels(self, rows):
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO levels (guild_id, user_id, xp) VALUES (?, ?, ?) "
+                "ON CONFLICT (guild_id, user_id) DO UPDATE SET xp = excluded.xp",
+                [(int(g), int(u), xp) for g, users in rows.items() for u, xp in users.items()],
+            )
+
+    def _append_audit(self, entries):
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO audit_log (guild_id, created_at, action, target_id, target, moderator_id, reason) "
+                "VALUES (:guild_id, :created_at, :action, :target_id, :target, :moderator_id, :reason)",
+                entries,
+            )
+
+    def _audit_rows(self, rows):
+        return [dict(zip(AUDIT_FIELDS, row)) for row in rows]
+
+    def _get_audit(self, guild_id, target_id, limit, offset):
+        columns = ", ".join(AUDIT_FIELDS)
+        if target_id is not None:
+            rows = self._db.execute(
+                f"SELECT {columns} FROM audit_log WHERE guild_id = ? AND target_id = ? ORDER BY id DESC LIMIT ? OFFSET ?",
+                (guild_id, target_id, limit, offset),
+            )
+        else:
+            rows = self._db.execute(
+                f"SELECT {columns} FROM audit_log WHERE guild_id = ? ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (guild_id, limit, offset),
+            )
+        return self._audit_rows(rows)
+
+    def _count_audit(self, guild_id, target_id):
+        return self._db.execute(
+            "SELECT COUNT(*) FROM audit_log WHERE guild_id = ? AND target_id = ?", (guild_id, target_id)
+        ).fetchone()[0]
+
+    def _audit_stats(self, guild_id, since):
+        if since is None:
+            rows = self._db.execute(
+                "SELECT moderator_id, action, COUNT(*) FROM audit_log WHERE guild_id = ? GROUP BY moderator_id, action",
+                (guild_id,),
+            )
+        else:
+            rows = self._db.execute(
+                "SELECT moderator_id, action, COUNT(*) FROM audit_log WHERE guild_id = ? AND created_at >= ? "
+                "GROUP BY moderator_id, action",
+                (guild_id, since),
+            )
+        stats = {}
+        for moderator_id, action, count in rows:
+            stats.setdefault(moderator_id, {})[action] = count
+        return stats
+
+    def _audit_page(self, guild_id, after, page_size):
+        # Keyset pagination on (created_at, id): each page is a range scan of idx_audit_time,
+        # however deep into the log it starts.
+        columns = ", ".join(AUDIT_FIELDS)
+        created_at, last_id = after
+        rows = self._db.execute(
+            f"SELECT {columns} FROM audit_log WHERE guild_id = ? AND created_at >= ? AND (created_at > ? OR id > ?) "
+            "ORDER BY created_at, id LIMIT ?",
+            (guild_id, created_at, created_at, last_id, page_size),
+        )
+        return self._audit_rows(rows)
+
+    def _get_document(self, namespace, key):
+        row = self._db.execute(
+            "SELECT value FROM documents WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _get_documents(self, namespace):
+        rows = self._db.execute("SELECT key, value FROM documents WHERE namespace = ?", (namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def _set_document(self, namespace, key, value):
+        with self._db:
+            self._db.execute(
+                "INSERT INTO documents (namespace, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value",
+                (namespace, key, json.dumps(value)),
+            )
+
+    def _delete_document(self, namespace, key):
+        with self._db:
+            self._db.execute("DELETE FROM documents WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def _update_documents(self, namespace, changes, merge):
+        rows = []
+        for key, change in changes.items():
+            rows.append((namespace, key, json.dumps(merge(self._get_document(namespace, key), change))))
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO documents (namespace, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value",
+                rows,
+            )
+
+
+def create_storage(backend, data_dir=".", legacy_dir=".", guild_filter=None, shared_dir=None):
+    """Open-able storage rooted at ``data_dir``.
+
+    The SQLite backend imports the original JSON files from ``legacy_dir`` on
+    first start, keeping only guilds accepted by ``guild_filter``. With
+    ``shared_dir``, IP bans are kept there for every process to share.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    if backend == "json":
+        return JsonStorage(
+            os.path.join(data_dir, WARN_FILE), os.path.join(data_dir, IP_BAN_FILE), os.path.join(data_dir, LEVELS_FILE)
+        )
+    if backend == "sqlite":
+        legacy = {
+            "warnings": os.path.join(legacy_dir, WARN_FILE),
+            "ip_bans": os.path.join(legacy_dir, IP_BAN_FILE),
+            "levels": os.path.join(legacy_dir, LEVELS_FILE),
+        }
+        shared_path = os.path.join(shared_dir, SHARED_DB_FILE) if shared_dir else None
+        return SQLiteStorage(os.path.join(data_dir, DB_FILE), legacy, guild_filter, shared_path)
+    raise ValueError(f"Unknown storage backend: {backend!r}")
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class LatencyTracker:
+    """Recent latency samples per command or listener, plus slow-call logging.
+
+    Every sample also feeds ``volt_<kind>_seconds`` in ``metrics``, so the
+    cumulative histograms live in Prometheus while ``summary`` answers "what
+    is slow right now" from the last ``window`` samples of each name.
+    """
+
+    def __init__(self, metrics, slow_threshold=1.0, window=500):
+        self.metrics = metrics
+        self.slow_threshold = slow_threshold
+        self.window = window
+        self.samples = {}
+
+    def record(self, kind, name, seconds):
+        self.metrics.observe(f"volt_{kind}_seconds", seconds, **{kind: name})
+        key = (kind, name)
+        recent = self.samples.get(key)
+        if recent is None:
+            recent = self.samples[key] = deque(maxlen=self.window)
+        recent.append(seconds)
+        if seconds >= self.slow_threshold:
+            print(f"[trace] Slow {kind} {name}: {seconds * 1000:.0f} ms")
+
+    def summary(self, kind):
+        """Return ``[(name, count, p50, p99, worst)]`` for ``kind``, slowest p99 first."""
+        rows = []
+        for (k, name), recent in self.samples.items():
+            if k != kind or not recent:
+                continue
+            ordered = sorted(recent)
+            rows.append((name, len(ordered), _percentile(ordered, 50), _percentile(ordered, 99), ordered[-1]))
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up and reports stalls as they happen.
+
+    A coroutine ticks every ``interval`` seconds and records how late each tick
+    was. A watchdog thread notices when ticks stop arriving for ``stall_after``
+    seconds and prints the loop thread's stack at that moment, which names the
+    blocking call while it is still running rather than after the fact.
+    """
+
+    def __init__(self, metrics, interval=0.5, stall_after=0.25):
+        self.metrics = metrics
+        self.interval = interval
+        self.stall_after = stall_after
+        self.last_lag = 0.0
+        self.worst_lag = 0.0
+        self.stalls = 0
+        self._last_tick = time.monotonic()
+        self._loop_thread = None
+        self._task = None
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def _tick(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_tick = now
+            self.last_lag = max(0.0, now - expected)
+            self.worst_lag = max(self.worst_lag, self.last_lag)
+            self.metrics.observe("volt_loop_lag_seconds", self.last_lag)
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(self.interval / 2):
+            tick = self._last_tick
+            stalled_for = time.monotonic() - tick - self.interval
+            if stalled_for < self.stall_after or reported == tick:
+                continue
+            reported = tick
+            self.stalls += 1
+            self.metrics.inc("volt_loop_stalls_total")
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame, limit=15)) if frame else "  (no frame)\n"
+            print(f"[trace] Event loop blocked for {stalled_for * 1000:.0f} ms+, loop thread is at:\n{stack}", end="")
+
+    async def close(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+IDLE_FUNCTIONS = {"select", "poll", "epoll"}
+# Event loop plumbing sits under every stack and would top the cumulative list.
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+def _sample(thread_id, seconds, interval, depth):
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+    me = threading.get_ident()
+    samples = 0
+    while time.monotonic() < deadline:
+        frames = sys._current_frames()
+        targets = [thread_id] if thread_id is not None else [t for t in frames if t != me]
+        for tid in targets:
+            frame = frames.get(tid)
+            stack = []
+            while frame is not None and len(stack) < depth:
+                code = frame.f_code
+                if not code.co_filename.startswith(_ASYNCIO_DIR):
+                    stack.append((os.path.basename(code.co_filename), frame.f_lineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                stacks[tuple(stack)] += 1
+        samples += 1
+        time.sleep(interval)
+    return samples, stacks
+
+
+async def sample_profile(seconds, interval=0.005, thread_id=None, depth=40, top=15):
+    """Sample the stacks of ``thread_id`` (default: the loop thread) for ``seconds``; return a text report.
+
+    Sampling runs in a worker thread, so the loop keeps serving events while
+    it is being observed.
+    """
+    if thread_id is None:
+        thread_id = threading.get_ident()
+    started = time.perf_counter()
+    samples, stacks = await asyncio.to_thread(_sample, thread_id, seconds, interval, depth)
+    elapsed = time.perf_counter() - started
+
+    own = Counter()
+    cumulative = Counter()
+    idle = 0
+    for stack, count in stacks.items():
+        leaf = stack[0]
+        if leaf[2] in IDLE_FUNCTIONS:
+            idle += count
+            continue
+        own[f"{leaf[2]} ({leaf[0]}:{leaf[1]})"] += count
+        for name in {f"{fn} ({filename})" for filename, _, fn in stack}:
+            cumulative[name] += count
+
+    total = sum(stacks.values()) or 1
+    lines = [
+        f"{samples} samples over {elapsed:.1f}s (every {interval * 1000:.0f} ms)",
+        f"Idle (waiting for events): {idle / total:.0%}",
+        "",
+        "Top functions by own time:",
+    ]
+    lines += [f"  {count / total:6.1%}  {name}" for name, count in own.most_common(top)]
+    lines += ["", "Top functions by cumulative time:"]
+    lines += [f"  {count / total:6.1%}  {name}" for name, count in cumulative.most_common(top)]
+    lines += ["", "Hottest stacks (innermost call last):"]
+    busy = [(stack, count) for stack, count in stacks.most_common() if stack[0][2] not in IDLE_FUNCTIONS]
+    for stack, count in busy[:5]:
+        lines.append(f"  {count / total:.1%}")
+        lines += [f"    {fn} ({filename}:{lineno})" for filename, lineno, fn in reversed(stack)]
+    return "\n".join(lines) + "\n"
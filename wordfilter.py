@@ -0,0 +1,71 @@
+import unicodedata
+
+ZERO_WIDTH = "\u00ad\u180e\u200b\u200c\u200d\u2060\ufeff"
+LEET = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "@": "a", "$": "s", "!": "i", "|": "l"}
+
+_TRANSLATION = str.maketrans({**dict.fromkeys(ZERO_WIDTH), **LEET})
+
+
+def normalize(text):
+    """Fold case, width and leetspeak and drop zero-width characters."""
+    text = unicodedata.normalize("NFKC", text)
+    return text.casefold().translate(_TRANSLATION)
+
+
+class WordMatcher:
+    """Aho–Corasick automaton over a fixed set of normalized terms.
+
+    Building is O(total pattern length); ``search`` walks the text once, so
+    its cost depends on the message length and not on how many terms exist.
+    """
+
+    def __init__(self, words):
+        self.words = frozenset(w for w in (normalize(word) for word in words) if w)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [None]
+        for word in self.words:
+            self._insert(word)
+        self._link()
+
+    def __len__(self):
+        return len(self.words)
+
+    def _insert(self, word):
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+            node = nxt
+        self._out[node] = word
+
+    def _link(self):
+        # Breadth-first so each node's fail target is finalized before its children.
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[child] is None:
+                    self._out[child] = self._out[self._fail[child]]
+
+    def search(self, text):
+        """Return the first term found in already-normalized ``text``, or None."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node] is not None:
+                return out[node]
+        return None